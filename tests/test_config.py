@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from whistler import config
+from whistler.config import _ttl_cache
+
+
+class _Lookups:
+    def __init__(self):
+        self._ttl_entries = {}
+        self._ttl_lock = threading.Lock()
+        self.calls = 0
+
+    @_ttl_cache(5)
+    def lookup(self, key):
+        self.calls += 1
+        return (key, self.calls)
+
+    @_ttl_cache(5)
+    def other(self, key):
+        self.calls += 1
+        return key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(config.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_reuses_result_until_expiry(clock):
+    lookups = _Lookups()
+    assert lookups.lookup("a") == ("a", 1)
+    clock[0] += 4.9
+    assert lookups.lookup("a") == ("a", 1)
+    clock[0] += 0.1
+    assert lookups.lookup("a") == ("a", 2)
+
+
+def test_ttl_cache_keys_on_method_and_arguments(clock):
+    lookups = _Lookups()
+    lookups.lookup("a")
+    lookups.lookup("b")
+    lookups.other("a")
+    assert lookups.calls == 3
+    assert len(lookups._ttl_entries) == 3
+
+
+def test_ttl_cache_is_per_instance(clock):
+    first, second = _Lookups(), _Lookups()
+    first.lookup("a")
+    assert second.lookup("a") == ("a", 1)
+    assert first.calls == second.calls == 1
+
+
+def test_ttl_cache_clear_drops_one_entry(clock):
+    lookups = _Lookups()
+    lookups.lookup("a")
+    lookups.lookup("b")
+    _Lookups.lookup.cache_clear(lookups, "a")
+    assert lookups.lookup("a") == ("a", 3)
+    assert lookups.lookup("b") == ("b", 2)
+    # Clearing an entry that isn't cached is a no-op
+    _Lookups.other.cache_clear(lookups, "a")
+
+
+def test_ttl_cache_evicts_expired_entries_when_full(clock, monkeypatch):
+    monkeypatch.setattr(config, "_TTL_CACHE_MAX", 3)
+    lookups = _Lookups()
+    lookups.lookup("a")
+    lookups.lookup("b")
+    clock[0] += 3
+    lookups.lookup("c")
+    clock[0] += 3
+    # "a" and "b" have expired, "c" is still fresh and survives the prune
+    lookups.lookup("d")
+    assert {args for _, args in lookups._ttl_entries} == {("c",), ("d",)}
+
+
+def test_ttl_cache_clears_when_full_of_fresh_entries(clock, monkeypatch):
+    monkeypatch.setattr(config, "_TTL_CACHE_MAX", 2)
+    lookups = _Lookups()
+    lookups.lookup("a")
+    lookups.lookup("b")
+    lookups.lookup("c")
+    assert {args for _, args in lookups._ttl_entries} == {("c",)}
@@ -0,0 +1,54 @@
+import asyncio
+import socket
+
+import pytest
+
+from whistler.server import _stream_socket
+
+
+class _Wrapper:
+    # Stands in for the kubernetes portforward socket wrapper, which forwards
+    # everything but setsockopt to the socket it holds
+    def __init__(self, sock):
+        self._socket = sock
+
+    def __getattr__(self, name):
+        return getattr(self._socket, name)
+
+
+async def _echo_roundtrip(sock, peer):
+    reader, writer = await asyncio.open_connection(sock=sock)
+    writer.write(b"ping")
+    await writer.drain()
+    assert await asyncio.to_thread(peer.recv, 4) == b"ping"
+    await asyncio.to_thread(peer.sendall, b"pong")
+    assert await reader.readexactly(4) == b"pong"
+    writer.close()
+    await writer.wait_closed()
+
+
+def _loop_factories():
+    factories = [asyncio.new_event_loop]
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        factories.append(uvloop.new_event_loop)
+    return factories
+
+
+@pytest.mark.parametrize("loop_factory", _loop_factories())
+def test_stream_socket_works_with_event_loop(loop_factory):
+    ours, peer = socket.socketpair()
+    wrapped = _Wrapper(ours)
+    sock = _stream_socket(wrapped)
+    try:
+        assert type(sock) is socket.socket
+        # The wrapper's socket no longer owns the descriptor
+        assert ours.fileno() == -1
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(_echo_roundtrip(sock, peer))
+    finally:
+        sock.close()
+        peer.close()
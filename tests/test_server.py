@@ -0,0 +1,114 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from textual import events
+
+from whistler import server
+from whistler.server import WhistlerDriver, WhistlerSession, _split_login
+
+
+@pytest.mark.parametrize("login, expected", [
+    ("alice", ("alice", None)),
+    ("alice-dev", ("alice", "dev")),
+    ("alice-dev-box", ("alice", "dev-box")),
+    ("alice-", ("alice", "")),
+])
+def test_split_login(login, expected):
+    assert _split_login(login) == expected
+
+
+class _App:
+    def __init__(self):
+        self.messages = []
+
+    def post_message(self, message):
+        self.messages.append(message)
+
+
+async def _feed(chunks):
+    app = _App()
+    driver = WhistlerDriver(app, size=(80, 24))
+    for chunk in chunks:
+        driver.feed_data(chunk)
+    return app.messages
+
+
+def test_feed_data_joins_escape_split_across_chunks():
+    messages = asyncio.run(_feed([b"\x1b[<0;1", b"0;5M"]))
+    assert len(messages) == 1
+    assert isinstance(messages[0], events.MouseDown)
+    assert (messages[0].x, messages[0].y) == (9, 4)
+
+
+def test_feed_data_waits_for_escape_tail():
+    messages = asyncio.run(_feed([b"\x1b[<0;10;5"]))
+    assert messages == []
+
+
+def test_feed_data_joins_utf8_split_across_chunks():
+    messages = asyncio.run(_feed([b"a\xc3", b"\xa9"]))
+    assert [m.character for m in messages] == ["a", "\xe9"]
+
+
+def _session(master_fd=42):
+    session = WhistlerSession()
+    session._master_fd = master_fd
+    session._loop = mock.Mock()
+    session._chan = mock.Mock()
+    return session
+
+
+def test_write_pty_chunks_keeps_unwritten_tail(monkeypatch):
+    monkeypatch.setattr(server.os, "writev", lambda fd, chunks: 5)
+    session = _session()
+    session._pty_chunks.extend([b"abc", b"defg", b"hi"])
+    session._write_pty_chunks()
+    assert session._pty_pending == b"fghi"
+    assert session._pty_chunks == []
+    session._loop.add_writer.assert_called_once_with(42, session._flush_pty)
+    session._chan.pause_reading.assert_not_called()
+
+
+def test_write_pty_chunks_would_block(monkeypatch):
+    def writev(fd, chunks):
+        raise BlockingIOError
+    monkeypatch.setattr(server.os, "writev", writev)
+    session = _session()
+    session._pty_chunks.extend([b"abc", b"def"])
+    session._write_pty_chunks()
+    assert session._pty_pending == b"abcdef"
+    session._loop.add_writer.assert_called_once()
+
+
+def test_write_pty_chunks_pauses_reading_above_high_water(monkeypatch):
+    monkeypatch.setattr(server.os, "writev", lambda fd, chunks: 0)
+    session = _session()
+    session._pty_chunks.append(b"x" * (server._WRITE_HIGH_WATER + 1))
+    session._write_pty_chunks()
+    session._chan.pause_reading.assert_called_once()
+
+
+def test_write_pty_queues_behind_pending_and_flush_resumes(monkeypatch):
+    monkeypatch.setattr(server.os, "writev", lambda fd, chunks: 1)
+    session = _session()
+    session._pty_chunks.append(b"abc")
+    session._write_pty_chunks()
+    # Later input must not overtake what is still pending
+    session._write_pty(b"d")
+    assert session._pty_pending == b"bcd"
+    assert session._pty_chunks == []
+
+    monkeypatch.setattr(server.os, "write", lambda fd, data: len(data))
+    session._flush_pty()
+    assert session._pty_pending == b""
+    session._loop.remove_writer.assert_called_once_with(42)
+    session._chan.resume_reading.assert_called_once()
+
+
+def test_write_pty_chunks_drops_input_without_master():
+    session = _session(master_fd=None)
+    session._pty_chunks.append(b"abc")
+    session._write_pty_chunks()
+    assert session._pty_chunks == []
+    assert session._pty_pending == b""
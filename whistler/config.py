@@ -1,22 +1,129 @@
-
+import base64
+import binascii
+import functools
 import logging
+import os
+import sys
+import threading
+import time
+import yaml
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
-from kubernetes import client, config as k8s_config
-from kubernetes.client import CoreV1Api, NetworkingV1Api
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import client, config as k8s_config, watch
+from kubernetes.client import ApiClient, CoreV1Api, NetworkingV1Api
 from kubernetes.client.rest import ApiException
-from sys import stderr
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
+# Mount paths not shown to users (service account tokens etc.)
+_SKIP_MOUNT_PREFIXES = ("/var/run/secrets",)
+
+# Seconds per pod watch request in wait_for_instance_pod, bounds how long a stopped wait lingers
+_WATCH_WINDOW = 5
+
+# In-process cache of parsed YAML: path -> ((st_mtime_ns, st_size), data)
+_YAML_MEMO: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_YAML_MEMO_LOCK = threading.Lock()
+
+def _load_yaml_cached(path: str) -> Any:
+    """Parse a YAML file, reusing earlier results while the file is unchanged."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _YAML_MEMO_LOCK:
+        entry = _YAML_MEMO.get(path)
+    if entry and entry[0] == stamp:
+        return entry[1]
+
+    # Hand raw bytes to the loader, it detects the encoding itself
+    data = yaml.load(Path(path).read_bytes(), Loader=_Loader)
+    with _YAML_MEMO_LOCK:
+        _YAML_MEMO[path] = (stamp, data)
+    return data
+
+# Bound on cached (method, args) entries per manager, expired ones are pruned past it
+_TTL_CACHE_MAX = 1024
+
+def _ttl_cache(seconds: float):
+    """Cache a method's result per instance and arguments for a few seconds.
+
+    Drop an entry with ``Class.method.cache_clear(instance, *args)``.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args):
+            key = (fn, args)
+            now = time.monotonic()
+            with self._ttl_lock:
+                entry = self._ttl_entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            # Computed outside the lock, concurrent misses may both call through
+            result = fn(self, *args)
+            with self._ttl_lock:
+                entries = self._ttl_entries
+                if len(entries) >= _TTL_CACHE_MAX:
+                    for stale in [k for k, v in entries.items() if v[0] <= now]:
+                        del entries[stale]
+                    if len(entries) >= _TTL_CACHE_MAX:
+                        entries.clear()
+                entries[key] = (now + seconds, result)
+            return result
+
+        def cache_clear(self, *args):
+            with self._ttl_lock:
+                self._ttl_entries.pop((fn, args), None)
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def _parse_key_blob(entry: str) -> Optional[bytes]:
+    """Return the binary public key from an authorized_keys style line, or a bare base64 key."""
+    for token in entry.split():
+        try:
+            blob = base64.b64decode(token, validate=True)
+        except (binascii.Error, ValueError):
+            continue
+        # The blob starts with its own length-prefixed key type, e.g. "ssh-ed25519"
+        type_len = int.from_bytes(blob[:4], "big")
+        if len(blob) > 4 and 0 < type_len < 64 and blob[4:4 + type_len].isascii():
+            return blob
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _detect_namespace() -> str:
+    namespace = os.environ.get("POD_NAMESPACE")
+    if not namespace:
+        try:
+            with open("/var/run/secrets/kubernetes.io/serviceaccount/namespace", "r") as f:
+                namespace = f.read().strip()
+        except FileNotFoundError:
+            namespace = "whistler" # Default fallback
+    return namespace
+
 class ConfigManager(ABC):
     @abstractmethod
     def get_user(self, username: str) -> Optional[Dict[str, Any]]:
         pass
 
     @abstractmethod
-    def get_user_templates(self, username: str) -> List[Dict[str, Any]]:
+    def get_user_templates(self, username: str) -> Sequence[Mapping[str, Any]]:
+        """Results may be cached and shared between callers. Only the top level is
+        read-only, copy nested values such as "resources" before changing them."""
         pass
 
     @abstractmethod
@@ -24,7 +131,18 @@ class ConfigManager(ABC):
         pass
 
     @abstractmethod
-    def get_user_instances(self, username: str) -> List[Dict[str, Any]]:
+    def get_user_instances(self, username: str) -> Sequence[Mapping[str, Any]]:
+        """Results may be cached and shared between callers, read-only."""
+        pass
+
+    @abstractmethod
+    def get_user_instance(self, username: str, instance_name: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def wait_for_instance_pod(self, username: str, instance_name: str, timeout: float = 60,
+                              on_status: Optional[Callable[[str], None]] = None,
+                              stop: Optional[threading.Event] = None) -> Optional[str]:
         pass
 
     @abstractmethod
@@ -49,35 +167,28 @@ class ConfigManager(ABC):
 
 class KubeConfigManager(ConfigManager):
     def __init__(self, kubeconfig: str = None):
-        try:
-            if kubeconfig:
-                k8s_config.load_kube_config(config_file=kubeconfig)
-            else:
-                k8s_config.load_incluster_config()
-        except k8s_config.ConfigException:
-            try:
-                 k8s_config.load_kube_config()
-            except k8s_config.ConfigException:
-                logger.warning("Could not load kubernetes config")
+        # Kubernetes config and clients are set up on first API use
+        self.kubeconfig = kubeconfig
+        self._k8s_loaded = False
+        self._api = None
+        self._core_api = None
+        self._net_api = None
+        # Websocket streams (exec, portforward) get a client of their own, see connect_stream
+        self._stream_api = None
+        self._stream_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="whistler-k8s")
+        self._ttl_entries = {}
+        self._ttl_lock = threading.Lock()
+        self._ensured_namespaces = set()
 
-        self.api = client.CustomObjectsApi()
-        self.group = "whistler.example.com"
-        self.version = "v1"
-        self.api = client.CustomObjectsApi()
         self.group = "whistler.example.com"
         self.version = "v1"
+        self.api_version = f"{self.group}/{self.version}"
         
-        # Determine namespace
-        import os
-        self.namespace = os.environ.get("POD_NAMESPACE")
-        if not self.namespace:
-            try:
-                with open("/var/run/secrets/kubernetes.io/serviceaccount/namespace", "r") as f:
-                    self.namespace = f.read().strip()
-            except FileNotFoundError:
-                self.namespace = "whistler" # Default fallback
+        self.namespace = _detect_namespace()
 
-        self.users = {}
+        self.users = MappingProxyType({})
+        self._user_key_blobs = MappingProxyType({})
         self._load_users()
 
         self.selectors = []
@@ -86,13 +197,62 @@ class KubeConfigManager(ConfigManager):
         self.volumes = []
         self._load_volumes()
 
-    def _get_user_namespace(self, username: str) -> str:
+    def _ensure_k8s_loaded(self):
+        if self._k8s_loaded:
+            return
+
+        try:
+            if self.kubeconfig:
+                k8s_config.load_kube_config(config_file=self.kubeconfig)
+            else:
+                k8s_config.load_incluster_config()
+        except k8s_config.ConfigException:
+            try:
+                 k8s_config.load_kube_config()
+            except k8s_config.ConfigException:
+                logger.warning("Could not load kubernetes config")
+
+        self._api = client.CustomObjectsApi()
+        self._core_api = CoreV1Api()
+        self._net_api = NetworkingV1Api()
+        self._k8s_loaded = True
+
+    @property
+    def api(self) -> client.CustomObjectsApi:
+        self._ensure_k8s_loaded()
+        return self._api
+
+    @property
+    def core_api(self) -> CoreV1Api:
+        self._ensure_k8s_loaded()
+        return self._core_api
+
+    @property
+    def net_api(self) -> NetworkingV1Api:
+        self._ensure_k8s_loaded()
+        return self._net_api
+
+    def connect_stream(self, open_stream: Callable, method: str, *args, **kwargs) -> Any:
+        """Open a websocket stream, e.g. kubernetes.stream.stream or portforward, on a CoreV1Api method."""
+        # Opening a stream temporarily swaps its ApiClient's request method, so streams
+        # use a client the regular API calls don't share and open one at a time
+        with self._stream_lock:
+            if self._stream_api is None:
+                self._stream_api = CoreV1Api(ApiClient(self.core_api.api_client.configuration))
+            return open_stream(getattr(self._stream_api, method), *args, **kwargs)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_user_namespace(username: str) -> str:
         return f"whistler-user-{username}"
 
     def _ensure_user_namespace(self, username: str) -> str:
         ns_name = self._get_user_namespace(username)
-        core_api = CoreV1Api()
-        net_api = NetworkingV1Api()
+        if ns_name in self._ensured_namespaces:
+            return ns_name
+
+        core_api = self.core_api
+        net_api = self.net_api
 
         # Ensure Namespace
         try:
@@ -139,16 +299,19 @@ class KubeConfigManager(ConfigManager):
             else:
                 pass # Ignore other errors or assume it exists
         
+        self._ensured_namespaces.add(ns_name)
         return ns_name
 
     def _load_users(self):
         try:
-            with open("/etc/whistler/users.yaml", "r") as f:
-                import yaml
-                data = yaml.safe_load(f)
-                if data:
-                    for u in data:
-                        self.users[u["name"]] = u
+            data = _load_yaml_cached("/etc/whistler/users.yaml")
+            if data:
+                # Interned so lookups with the (also interned) login name hit on identity
+                self.users = MappingProxyType({sys.intern(u["name"]): u for u in data})
+                self._user_key_blobs = MappingProxyType({
+                    name: frozenset(blob for k in u.get("publicKeys", []) if (blob := _parse_key_blob(k)))
+                    for name, u in self.users.items()
+                })
         except FileNotFoundError:
             logger.warning("No users.yaml found at /etc/whistler/users.yaml")
         except Exception as e:
@@ -168,142 +331,250 @@ class KubeConfigManager(ConfigManager):
             return user.get("publicKeys", [])
         return []
 
-        templates.sort(key=lambda x: x.get("source", ""))
-        return templates
+    def get_user_key_blobs(self, username: str) -> frozenset:
+        # Decoded once at load time, so key checks are a set lookup
+        return self._user_key_blobs.get(username, frozenset())
 
-    def get_user_templates(self, username: str) -> List[Dict[str, Any]]:
-        templates = []
+    def _list_templates(self, namespace: str) -> List[Dict[str, Any]]:
+        try:
+            resp = self.api.list_namespaced_custom_object(
+                self.group, self.version, namespace, "whistlertemplates"
+            )
+            return resp.get("items", [])
+        except ApiException as e:
+            if e.status != 404:
+                logger.error(f"Failed to list templates in {namespace}: {e}")
+            return []
+
+    @_ttl_cache(5)
+    def get_user_templates(self, username: str) -> Sequence[Mapping[str, Any]]:
+        system_templates = []
+        user_templates = []
         user_ns = self._get_user_namespace(username)
-        namespaces_to_search = [self.namespace] # System namespace
-        
-        # If user namespace is different (likely always true), search it too
-        if user_ns != self.namespace:
-             namespaces_to_search.append(user_ns)
 
-        for ns in namespaces_to_search:
-            try:
-                # List WhistlerTemplates
-                resp = self.api.list_namespaced_custom_object(
-                    self.group, self.version, ns, "whistlertemplates"
-                )
-                for item in resp.get("items", []):
-                    t = item.get("spec", {})
-                    full_name = item["metadata"]["name"]
-                    
-                    # Determine source and display name
-                    owner = t.get("user", "system")
-                    
-                    # If fetching from system namespace, include only system templates
-                    if ns == self.namespace:
-                         if owner != "system" and owner != username: continue # Should not happen usually
-                         # We include "system" templates. 
-                         # What if a user puts their template in system NS? We might allow it or filter.
-                         # Existing logic filtered by owner.
-                         pass
-
-                    if owner == "system":
-                        t["name"] = full_name
-                        t["fullName"] = full_name
-                        t["source"] = "system"
-                        templates.append(t)
-                    elif owner == username:
-                        # Strip prefix if present
-                        display_name = full_name
-                        if full_name.startswith(f"{username}-"):
-                            display_name = full_name[len(username)+1:]
-                        t["name"] = display_name
-                        t["fullName"] = full_name
-                        t["source"] = "user"
-                        templates.append(t)
-                    # Else: ignore other users' templates
-            except ApiException as e:
-                if e.status != 404:
-                     logger.error(f"Failed to list templates in {ns}: {e}")
+        # Both namespaces are listed whole, templates created before the owner label existed
+        # carry none
+        user_future = None
+        if user_ns != self.namespace:
+            user_future = self._executor.submit(self._list_templates, user_ns)
+        items = self._list_templates(self.namespace)
+        if user_future:
+            items = items + user_future.result()
+
+        prefix = username + "-"
+        for item in items:
+            ns = item["metadata"].get("namespace")
+            t = item.get("spec", {})
+            full_name = item["metadata"]["name"]
+            
+            # Determine source and display name
+            owner = t.get("user", "system")
+            
+            # If fetching from system namespace, include only system templates
+            if ns == self.namespace:
+                 if owner != "system" and owner != username: continue # Should not happen usually
+                 # We include "system" templates. 
+                 # What if a user puts their template in system NS? We might allow it or filter.
+                 # Existing logic filtered by owner.
+                 pass
+
+            if owner == "system":
+                t["name"] = full_name
+                t["fullName"] = full_name
+                t["source"] = "system"
+                system_templates.append(MappingProxyType(t))
+            elif owner == username:
+                # Strip prefix if present
+                t["name"] = full_name.removeprefix(prefix)
+                t["fullName"] = full_name
+                t["source"] = "user"
+                user_templates.append(MappingProxyType(t))
+            # Else: ignore other users' templates
             
         # Deduplicate? If same name exists in both? 
         # For now, append all. Client might handle it or we assume distinct names.
         
-        # Sort: system first
-        templates.sort(key=lambda x: x.get("source", ""))
-        return templates
+        # System first. Cached and shared between sessions, so read-only
+        return tuple(system_templates + user_templates)
+
+    @_ttl_cache(5)
+    def get_user_template_names(self, username: str) -> frozenset:
+        return frozenset(t["name"] for t in self.get_user_templates(username))
 
-    def get_user_instances(self, username: str) -> List[Dict[str, Any]]:
-        instances = []
+    @_ttl_cache(1)
+    def get_user_instances(self, username: str) -> Sequence[Mapping[str, Any]]:
+        # Cached and shared between sessions, so a tuple of read-only instances
+        instances = ()
         user_ns = self._get_user_namespace(username)
         
         try:
-            # List WhistlerInstances in user namespace
-            resp = self.api.list_namespaced_custom_object(
+            # List WhistlerInstances in user namespace and Pods for this user concurrently
+            resp_future = self._executor.submit(
+                self.api.list_namespaced_custom_object,
                 self.group, self.version, user_ns, "whistlerinstances"
             )
-            
-            # List Pods for this user
-            core_api = client.CoreV1Api()
+            pods_future = self._executor.submit(
+                self._list_pods, user_ns, f"user={username},app=whistler-instance"
+            )
+            items = resp_future.result().get("items", [])
+
+            # No instances to correlate, don't wait on the pod list
+            if not items:
+                pods_future.cancel()
+                return instances
+
             try:
-                pods = core_api.list_namespaced_pod(
-                    user_ns, label_selector=f"user={username}"
-                )
-                pod_map = {p.metadata.labels.get("instance"): p for p in pods.items}
+                pods = pods_future.result()
+                pod_map = {lbl: p for p in pods if (lbl := (p["metadata"].get("labels") or {}).get("instance"))}
             except ApiException:
                 pod_map = {}
 
-            for item in resp.get("items", []):
-                spec = item.get("spec", {})
-                full_name = item["metadata"]["name"]
-                # Strip username prefix for display
-                display_name = full_name
-                if full_name.startswith(f"{username}-"):
-                    display_name = full_name[len(username)+1:]
-                        
-                pod = pod_map.get(full_name)
-                
-                pod_status = "Stopped" # Default if no pod
-                pod_name = None
-                pod_ip = None
-                
-                if pod:
-                    pod_name = pod.metadata.name
-                    pod_status = pod.status.phase
-                    if pod.metadata.deletion_timestamp:
-                        pod_status = "Terminating"
-                    pod_ip = pod.status.pod_ip
-                    
-                mounts = []
-                if pod and pod.spec and pod.spec.containers:
-                        # Assume first container is the main one
-                        # Python k8s client uses snake_case for attributes
-                        for m in pod.spec.containers[0].volume_mounts or []:
-                            # Skip service account tokens (usuall mounted at /var/run/secrets/...)
-                            if not m.mount_path.startswith("/var/run/secrets"):
-                                mounts.append({"name": m.name, "mountPath": m.mount_path})
-
-                inst = {
-                    "name": display_name,
-                    "template": spec.get("templateRef"),
-                    "status": pod_status,
-                    "podName": pod_name,
-                    "namespace": user_ns,
-                    "ip": pod_ip,
-                    "sshHost": None, 
-                    "sshPort": None,
-                    "mounts": mounts,
-                    "preemptible": spec.get("preemptible", False)
-                }
-                instances.append(inst)
+            # CRs without a pod still have to be listed (as pending), so join from the CR side
+            prefix = username + "-"
+            pod_for = pod_map.get
+            instances = tuple(
+                self._instance_from_cr(item, pod_for(item["metadata"]["name"]), prefix, user_ns)
+                for item in items
+            )
         except ApiException as e:
             if e.status != 404: # Namespace might not exist yet
                 logger.error(f"Failed to list instances: {e}")
         return instances
 
+    def get_user_instance(self, username: str, instance_name: str) -> Optional[Dict[str, Any]]:
+        user_ns = self._get_user_namespace(username)
+        full_name = f"{username}-{instance_name}"
+
+        # Fetch the one CR and its pod by name instead of listing every instance
+        item_future = self._executor.submit(
+            self.api.get_namespaced_custom_object,
+            self.group, self.version, user_ns, "whistlerinstances", full_name
+        )
+        pods_future = self._executor.submit(
+            self._list_pods, user_ns, f"instance={full_name},app=whistler-instance"
+        )
+        try:
+            item = item_future.result()
+        except ApiException as e:
+            pods_future.cancel()
+            if e.status != 404:
+                logger.error(f"Failed to get instance {full_name}: {e}")
+            return None
+
+        try:
+            pods = pods_future.result()
+            pod = pods[0] if pods else None
+        except ApiException:
+            pod = None
+
+        return self._instance_from_cr(item, pod, username + "-", user_ns)
+
+    def wait_for_instance_pod(self, username: str, instance_name: str, timeout: float = 60,
+                              on_status: Optional[Callable[[str], None]] = None,
+                              stop: Optional[threading.Event] = None) -> Optional[str]:
+        """Watch the instance's pod until it is Running and return its name, None on timeout.
+
+        on_status is called with every status the pod passes through on the way. Setting
+        stop ends the wait early with None.
+        """
+        user_ns = self._get_user_namespace(username)
+        full_name = f"{username}-{instance_name}"
+
+        deadline = time.monotonic() + timeout
+        last_status = None
+        # Watches run in short windows, a blocked read only notices stop between them
+        while not (stop and stop.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            w = watch.Watch()
+            for event in w.stream(
+                self.core_api.list_namespaced_pod, user_ns,
+                field_selector=f"metadata.name={full_name}",
+                timeout_seconds=max(1, int(min(remaining, _WATCH_WINDOW))),
+            ):
+                if stop and stop.is_set():
+                    w.stop()
+                    return None
+                pod = event["raw_object"]
+                if event["type"] == "ERROR":
+                    raise ApiException(status=pod.get("code"), reason=pod.get("message"))
+                if event["type"] == "DELETED":
+                    status = "Stopped"
+                elif pod["metadata"].get("deletionTimestamp"):
+                    status = "Terminating"
+                else:
+                    status = (pod.get("status") or {}).get("phase")
+
+                if status == "Running":
+                    w.stop()
+                    return pod["metadata"]["name"]
+                if status != last_status and on_status:
+                    on_status(status)
+                last_status = status
+        return None
+
+    def _list_pods(self, namespace: str, label_selector: str) -> List[Dict[str, Any]]:
+        # Decode the raw response ourselves, we only read a handful of fields
+        # and the client's V1Pod model hydration dominates the cost otherwise
+        resp = self.core_api.list_namespaced_pod(
+            namespace, label_selector=label_selector, _preload_content=False
+        )
+        return _json_loads(resp.data).get("items", [])
+
+    def _instance_from_cr(self, item: Dict[str, Any], pod: Optional[Dict[str, Any]], prefix: str, user_ns: str) -> Mapping[str, Any]:
+        spec = item.get("spec", {})
+        full_name = item["metadata"]["name"]
+        # Strip username prefix for display
+        display_name = full_name.removeprefix(prefix)
+
+        pod_status = "Stopped" # Default if no pod
+        pod_name = None
+        pod_ip = None
+        
+        if pod:
+            pod_meta = pod["metadata"]
+            pod_state = pod.get("status") or {}
+            pod_name = pod_meta["name"]
+            pod_status = pod_state.get("phase")
+            if pod_meta.get("deletionTimestamp"):
+                pod_status = "Terminating"
+            pod_ip = pod_state.get("podIP")
+            
+        mounts = []
+        containers = (pod.get("spec") or {}).get("containers") if pod else None
+        if containers:
+                # Assume first container is the main one
+                for m in containers[0].get("volumeMounts") or []:
+                    # Skip service account tokens (usuall mounted at /var/run/secrets/...)
+                    if not m["mountPath"].startswith(_SKIP_MOUNT_PREFIXES):
+                        mounts.append(MappingProxyType({"name": m["name"], "mountPath": m["mountPath"]}))
+
+        return MappingProxyType({
+            "name": display_name,
+            "template": spec.get("templateRef"),
+            "status": pod_status,
+            "podName": pod_name,
+            "namespace": user_ns,
+            "ip": pod_ip,
+            "sshHost": None, 
+            "sshPort": None,
+            "mounts": tuple(mounts),
+            "preemptible": spec.get("preemptible", False)
+        })
+
     def add_instance(self, username: str, template_name: str, instance_name: str, preemptible: bool = False) -> bool:
         user_ns = self._ensure_user_namespace(username)
         
         body = {
-            "apiVersion": f"{self.group}/{self.version}",
+            "apiVersion": self.api_version,
             "kind": "WhistlerInstance",
             "metadata": {
                 "name": f"{username}-{instance_name}",
-                "namespace": user_ns
+                "namespace": user_ns,
+                "labels": {
+                    "whistler.example.com/user": username
+                }
             },
             "spec": {
                 "templateRef": template_name,
@@ -315,8 +586,12 @@ class KubeConfigManager(ConfigManager):
             self.api.create_namespaced_custom_object(
                 self.group, self.version, user_ns, "whistlerinstances", body
             )
+            KubeConfigManager.get_user_instances.cache_clear(self, username)
             return True
         except ApiException as e:
+            if e.status == 404:
+                # Namespace removed behind our back, re-create it next time
+                self._ensured_namespaces.discard(user_ns)
             logger.error(f"Failed to create instance: {e}")
             return False
 
@@ -333,11 +608,14 @@ class KubeConfigManager(ConfigManager):
         user_ns = self._ensure_user_namespace(username)
         
         body = {
-            "apiVersion": f"{self.group}/{self.version}",
+            "apiVersion": self.api_version,
             "kind": "WhistlerTemplate",
             "metadata": {
                 "name": full_name,
-                "namespace": user_ns
+                "namespace": user_ns,
+                "labels": {
+                    "whistler.example.com/user": username
+                }
             },
             "spec": {
                 "user": username,
@@ -349,23 +627,16 @@ class KubeConfigManager(ConfigManager):
                 "volumes": template_data.get("volumes")
             }
         }
-        import sys
-        print(f"DEBUG: Saving template body: {body}", file=sys.stderr)
+        logger.debug("Saving template body: %s", body)
         try:
-            # Check if exists to update, or create
+            # Patch only what we own if it exists, otherwise create
             try:
-                self.api.get_namespaced_custom_object(
-                    self.group, self.version, user_ns, "whistlertemplates", full_name
-                )
-                # Update (replace)
-                # We need to preserve resourceVersion to update
-                existing = self.api.get_namespaced_custom_object(
-                    self.group, self.version, user_ns, "whistlertemplates", full_name
-                )
-                body["metadata"]["resourceVersion"] = existing["metadata"]["resourceVersion"]
-                
-                self.api.replace_namespaced_custom_object(
-                    self.group, self.version, user_ns, "whistlertemplates", full_name, body
+                patch = {
+                    "metadata": {"labels": body["metadata"]["labels"]},
+                    "spec": body["spec"]
+                }
+                self.api.patch_namespaced_custom_object(
+                    self.group, self.version, user_ns, "whistlertemplates", full_name, patch
                 )
             except ApiException as e:
                 if e.status == 404:
@@ -375,18 +646,23 @@ class KubeConfigManager(ConfigManager):
                     )
                 else:
                     raise e
+            KubeConfigManager.get_user_templates.cache_clear(self, username)
+            KubeConfigManager.get_user_template_names.cache_clear(self, username)
             return True
         except ApiException as e:
+            if e.status == 404:
+                self._ensured_namespaces.discard(user_ns)
             logger.error(f"Failed to save template: {e}")
             return False
 
     def delete_instance(self, username: str, instance_name: str) -> bool:
-        print(f"Deleting instance {username}-{instance_name}", file=stderr, flush=True)
+        logger.info(f"Deleting instance {username}-{instance_name}")
         user_ns = self._get_user_namespace(username)
         try:
             self.api.delete_namespaced_custom_object(
                 self.group, self.version, user_ns, "whistlerinstances", f"{username}-{instance_name}"
             )
+            KubeConfigManager.get_user_instances.cache_clear(self, username)
             return True
         except ApiException as e:
             logger.error(f"Failed to delete instance: {e}")
@@ -394,11 +670,9 @@ class KubeConfigManager(ConfigManager):
 
     def _load_selectors(self):
         try:
-            with open("/etc/whistler-config/selectors.yaml", "r") as f:
-                import yaml
-                data = yaml.safe_load(f)
-                if data:
-                    self.selectors = data
+            data = _load_yaml_cached("/etc/whistler-config/selectors.yaml")
+            if data:
+                self.selectors = data
         except FileNotFoundError:
             logger.warning("No selectors.yaml found at /etc/whistler-config/selectors.yaml")
         except Exception as e:
@@ -409,11 +683,9 @@ class KubeConfigManager(ConfigManager):
 
     def _load_volumes(self):
         try:
-            with open("/etc/whistler-config/volumes.yaml", "r") as f:
-                import yaml
-                data = yaml.safe_load(f)
-                if data:
-                    self.volumes = data
+            data = _load_yaml_cached("/etc/whistler-config/volumes.yaml")
+            if data:
+                self.volumes = data
         except FileNotFoundError:
             logger.warning("No volumes.yaml found at /etc/whistler-config/volumes.yaml")
         except Exception as e:
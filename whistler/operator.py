@@ -1,15 +1,44 @@
 import kopf
-import kubernetes
-import yaml
-from kubernetes import client, config
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import client
+
+# Templates change far less often than instances reconcile, keep fetched ones briefly
+TEMPLATE_CACHE_TTL = 30
+_TEMPLATE_CACHE = {}
+# Bound on cached templates, expired ones are pruned past it
+_TEMPLATE_CACHE_MAX = 256
+
+# User PVCs are never removed by the operator, once seen they can be trusted
+_PVC_EXISTS = set()
+
+# Runs independent API calls of a reconcile side by side
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="whistler-operator")
+
+# Constant parts of every instance pod, merged into the per-instance fields
+_POD_BASE = {
+    "apiVersion": "v1",
+    "kind": "Pod",
+}
+_MAIN_CONTAINER_BASE = {
+    "name": "main",
+    "command": ["sleep", "3600"],
+}
+_POD_SPEC_BASE = {
+    "subdomain": "whistler", # Optional: for stable DNS if we had a service
+}
 
 def ensure_pvc(user, namespace, logger):
     pvc_name = f"whistler-data-{user}"
+    if (namespace, pvc_name) in _PVC_EXISTS:
+        return pvc_name
+
     api = client.CoreV1Api()
     
     try:
         api.read_namespaced_persistent_volume_claim(pvc_name, namespace)
         # logger.info(f"PVC {pvc_name} already exists")
+        _PVC_EXISTS.add((namespace, pvc_name))
         return pvc_name
     except client.rest.ApiException as e:
         if e.status != 404:
@@ -43,29 +72,29 @@ def ensure_pvc(user, namespace, logger):
     try:
         api.create_namespaced_persistent_volume_claim(namespace, pvc_body)
         logger.info(f"PVC {pvc_name} created")
+        _PVC_EXISTS.add((namespace, pvc_name))
         return pvc_name
     except client.rest.ApiException as e:
         raise kopf.PermanentError(f"Failed to create PVC: {e}")
 
 def load_volume_definitions():
     import yaml
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
         with open("/etc/whistler-config/volumes.yaml", "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
             return {v['name']: v for v in data} if data else {}
     except Exception as e:
         # It's possible the file doesn't exist if not configured
         return {}
 
-def ensure_pod(spec, name, namespace, logger, **kwargs):
-    logger.info(f"Ensuring pod for instance {name}")
-    
-    template_ref = spec.get('templateRef')
-    user = spec.get('user')
-    preemptible = spec.get('preemptible', False)
-    
-    # Fetch template details
-    # Fetch template details
+def fetch_template(template_ref, namespace):
+    cache_key = (namespace, template_ref)
+    cached = _TEMPLATE_CACHE.get(cache_key)
+    if cached and time.monotonic() - cached[0] < TEMPLATE_CACHE_TTL:
+        return cached[1]
+
     custom_api = client.CustomObjectsApi()
     template = None
     try:
@@ -98,7 +127,41 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
                  raise kopf.TemporaryError(f"Template {template_ref} not found", delay=10)
         else:
             raise kopf.PermanentError(f"Failed to fetch template: {e}")
-            
+
+    now = time.monotonic()
+    if len(_TEMPLATE_CACHE) >= _TEMPLATE_CACHE_MAX:
+        for stale in [k for k, v in _TEMPLATE_CACHE.items() if now - v[0] >= TEMPLATE_CACHE_TTL]:
+            del _TEMPLATE_CACHE[stale]
+        if len(_TEMPLATE_CACHE) >= _TEMPLATE_CACHE_MAX:
+            _TEMPLATE_CACHE.clear()
+    _TEMPLATE_CACHE[cache_key] = (now, template)
+    return template
+
+def ensure_pod(spec, name, namespace, logger, **kwargs):
+    logger.info(f"Ensuring pod for instance {name}")
+    
+    template_ref = spec.get('templateRef')
+    user = spec.get('user')
+    preemptible = spec.get('preemptible', False)
+
+    # Steady state: the pod already exists, nothing to build or create
+    api = client.CoreV1Api()
+    try:
+        existing_pod = api.read_namespaced_pod(name, namespace)
+        if existing_pod.metadata.deletion_timestamp:
+            logger.info(f"Pod {name} is terminating. Waiting...")
+            raise kopf.TemporaryError("Pod is terminating", delay=2)
+        return
+    except client.rest.ApiException as e:
+        if e.status != 404:
+            raise kopf.PermanentError(f"Failed to check pod: {e}")
+    
+    # The PVC doesn't depend on the template, check/create it while the template is fetched
+    pvc_future = _EXECUTOR.submit(ensure_pvc, user, namespace, logger)
+
+    # Fetch template details
+    template = fetch_template(template_ref, namespace)
+
     template_spec = template.get('spec', {})
 
     image = template_spec.get('image', 'ubuntu:latest')
@@ -128,12 +191,10 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
     
     # Use CR name as pod name (it should already be unique and prefixed with user)
     pod_name = name
-    hostname = name
-    if name.startswith(f"{user}-"):
-        hostname = name[len(user)+1:]
+    hostname = name.removeprefix(f"{user}-")
     
     # Ensure PVC exists
-    pvc_name = ensure_pvc(user, namespace, logger)
+    pvc_name = pvc_future.result()
     
     # Load available volume definitions
     available_volumes = load_volume_definitions()
@@ -171,8 +232,7 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
              logger.warning(f"Requested volume '{vol_name}' not found in configuration.")
 
     pod_body = {
-        "apiVersion": "v1",
-        "kind": "Pod",
+        **_POD_BASE,
         "metadata": {
             "name": pod_name,
             "labels": {
@@ -182,11 +242,11 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
             }
         },
         "spec": {
+            **_POD_SPEC_BASE,
             "containers": [
                 {
-                    "name": "main",
+                    **_MAIN_CONTAINER_BASE,
                     "image": image,
-                    "command": ["sleep", "3600"],
                     "resources": resource_reqs,
                     "volumeMounts": volume_mounts
                 }
@@ -194,7 +254,6 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
             "volumes": pod_volumes,
             "nodeSelector": node_selector,
             "hostname": hostname,
-            "subdomain": "whistler" # Optional: for stable DNS if we had a service
         }
     }
     
@@ -204,7 +263,6 @@ def ensure_pod(spec, name, namespace, logger, **kwargs):
     # Adopt the pod so it gets deleted when the WhistlerInstance is deleted
     kopf.adopt(pod_body)
     
-    api = client.CoreV1Api()
     try:
         api.create_namespaced_pod(namespace, pod_body)
         logger.info(f"Pod {pod_name} created")
@@ -235,6 +293,10 @@ def reconcile_fn(spec, name, namespace, logger, meta, **kwargs):
         
     ensure_pod(spec, name, namespace, logger, meta=meta, **kwargs)
 
+@kopf.on.delete('', 'v1', 'persistentvolumeclaims', labels={'app': 'whistler'}, optional=True)
+def forget_pvc_fn(name, namespace, **kwargs):
+    _PVC_EXISTS.discard((namespace, name))
+
 @kopf.on.delete('whistler.example.com', 'v1', 'whistlerinstances')
 def delete_fn(spec, name, namespace, logger, **kwargs):
     logger.info(f"Deleting instance {name}")
@@ -1,126 +1,224 @@
 import asyncio
 import asyncssh
+import codecs
+import logging
 import sys
 import os
 import pty
 import fcntl
 import termios
+import socket
 import struct
-import traceback
+import threading
 from textual.driver import Driver
 from textual.app import App
 from textual.geometry import Size
 from textual.events import Resize
+from textual.message import Message
 from textual._xterm_parser import XTermParser
 from whistler.tui import WhistlerApp, LoadingScreen
 
 import argparse
 from functools import partial
-from functools import partial
 from whistler.config import ConfigManager, KubeConfigManager
-from asyncio import Event
 from textual.worker import Worker, WorkerState
+from kubernetes.stream import portforward, stream
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+# Strong references to fire-and-forget tasks, the loop itself only keeps weak ones
+_BACKGROUND_TASKS = set()
+
+def _spawn(coro, name=None):
+    task = asyncio.create_task(coro, name=name)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+# Buffered bytes above which the producer is paused: PTY/process output when the SSH
+# channel backs up, channel input when the PTY or process stdin backs up
+_WRITE_HIGH_WATER = 256 * 1024
+
+# Upper bound on PTY output gathered per reader wakeup and sent as one channel write
+_PTY_BUF_SIZE = 256 * 1024
+
+# Most buffers a single writev accepts
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if "SC_IOV_MAX" in os.sysconf_names else 1024
+
+# Read size for byte pumps (agent bridge, exec pipes). Interactive traffic arrives in
+# small pieces whatever the size, only bulk transfers read full chunks
+_BRIDGE_CHUNK = int(os.environ.get("WHISTLER_BRIDGE_CHUNK", 64 * 1024))
 
+# Set to "true" to run port forwards and pod command checks through kubectl
+# subprocesses instead of the Kubernetes portforward/exec websocket APIs
+_TUNNEL_VIA_KUBECTL = os.environ.get("WHISTLER_TUNNEL_KUBECTL") == "true"
 
+def _open_portforward(config_manager, pod_name, namespace, port):
+    return config_manager.connect_stream(
+        portforward, "connect_get_namespaced_pod_portforward",
+        pod_name, namespace, ports=str(port)
+    )
 
+def _stream_socket(wrapped):
+    """Take over the socket behind a portforward's socket wrapper.
 
+    The client hands out a wrapper around its end of a socketpair, event loops
+    such as uvloop only accept real socket objects.
+    """
+    return socket.socket(fileno=wrapped.detach())
+
+def _open_exec(config_manager, pod_name, namespace, command):
+    return config_manager.connect_stream(
+        stream, "connect_get_namespaced_pod_exec", pod_name, namespace,
+        command=command, stdout=True, stderr=True, _preload_content=False
+    )
+
+def _exec_succeeds(config_manager, pod_name, namespace, command, timeout=30):
+    ws = _open_exec(config_manager, pod_name, namespace, command)
+    try:
+        ws.run_forever(timeout=timeout)
+        return ws.returncode == 0
+    except Exception:
+        # No exit status at all, e.g. the command couldn't be started
+        return False
+    finally:
+        ws.close()
+
+# struct winsize (rows, cols, xpixel, ypixel) for TIOCSWINSZ
+_WINSIZE = struct.Struct("HHHH")
+
+def _set_pty_size(fd, cols, rows):
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, _WINSIZE.pack(rows, cols, 0, 0))
+
+# Mouse reporting (X10, SGR, urxvt), alt screen and hidden cursor while the TUI runs
+_ENABLE_TTY = "\x1b[?1000h\x1b[?1006h\x1b[?1015h\x1b[?1049h\x1b[?25l"
+_DISABLE_TTY = "\x1b[?1000l\x1b[?1006l\x1b[?1015l\x1b[?1049l\x1b[?25h"
 
 class WhistlerDriver(Driver):
     def __init__(self, next_driver: Driver | None = None, *, debug: bool = False, size: tuple[int, int] | None = None, **kwargs):
         super().__init__(next_driver, debug=debug, size=size)
         self._parser = XTermParser(debug=debug)
-        self.exit_event = Event()
-        print("WhistlerDriver initialized", file=sys.stderr, flush=True)
+        # Keeps a multibyte character split across SSH packets until its tail arrives
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._write_buf: list[str] = []
+        self._flush_scheduled = False
+        # Bound ssh_channel.write, resolved once while in application mode
+        self._channel_write = None
+        # Set while the channel is over its high-water mark, frames written meanwhile are dropped
+        self._output_paused = False
+        # Frames were dropped while paused, the screen is redrawn in full on resume
+        self._repaint_pending = False
+        # Resolved when input is disabled, created once the loop is running
+        self.exit_event: asyncio.Future | None = None
+        logger.debug("WhistlerDriver initialized")
+
+    def write(self, data: str) -> None:
+        if self._output_paused:
+            # A stalled client only needs the latest screen, not every frame in between
+            self._repaint_pending = True
+            return
+        # Textual hands over str, kept as is and encoded once per flush
+        self._write_buf.append(data)
+        if not self._flush_scheduled:
+            # Writes not followed by an explicit flush go out at the end of this loop turn
+            try:
+                asyncio.get_running_loop().call_soon(self._scheduled_flush)
+                self._flush_scheduled = True
+            except RuntimeError:
+                self.flush()
 
-    def write(self, data: str | bytes) -> None:
-        # print(f"WhistlerDriver.write: {len(data)} bytes: {repr(data)[:50]}", file=sys.stderr, flush=True)
-        if self._app and self._app.ssh_channel:
-            if isinstance(data, str):
-                data = data.encode('utf-8')
-            self._app.ssh_channel.write(data)
+    def _scheduled_flush(self) -> None:
+        self._flush_scheduled = False
+        self.flush()
 
     def flush(self) -> None:
-        # No explicit flush needed for asyncssh channel write
-        pass
+        # Send everything buffered since the last flush as a single channel write
+        if not self._write_buf or self._output_paused:
+            return
+        data = "".join(self._write_buf)
+        self._write_buf.clear()
+        channel_write = self._channel_write
+        if channel_write is None and self._app and self._app.ssh_channel:
+            channel_write = self._app.ssh_channel.write
+        if channel_write is not None:
+            channel_write(data.encode('utf-8'))
+
+    def pause_output(self) -> None:
+        self._output_paused = True
+
+    def resume_output(self) -> None:
+        self._output_paused = False
+        self.flush()
+        if self._repaint_pending:
+            self._repaint_pending = False
+            if self._app:
+                self._app.refresh(layout=True)
 
     def start_application_mode(self) -> None:
-        print("WhistlerDriver.start_application_mode", file=sys.stderr, flush=True)
+        logger.debug("WhistlerDriver.start_application_mode")
+        self.exit_event = asyncio.get_running_loop().create_future()
+        if self._app and self._app.ssh_channel:
+            self._channel_write = self._app.ssh_channel.write
         
         # Send initial size event
         size = (80, 24) # Default fallback
-        if self._app and hasattr(self._app, 'session') and self._app.session:
-             size = self._app.session.initial_term_size
-             print(f"Using initial_term_size from session: {size}", file=sys.stderr, flush=True)
-        elif self._app and hasattr(self._app, 'initial_term_size'):
-             size = self._app.initial_term_size
-             print(f"Using initial_term_size from app: {size}", file=sys.stderr, flush=True)
+        session = getattr(self._app, 'session', None)
+        app_term_size = getattr(self._app, 'initial_term_size', None)
+        if session:
+             size = session.initial_term_size
+             logger.debug(f"Using initial_term_size from session: {size}")
+        elif app_term_size is not None:
+             size = app_term_size
+             logger.debug(f"Using initial_term_size from app: {size}")
         elif self._app and self._app.ssh_channel:
              term_size = self._app.ssh_channel.get_terminal_size()
              if term_size:
                  size = term_size[:2]
         
-        # Enable mouse support
-        self.write("\x1b[?1000h")
-        self.write("\x1b[?1006h")
-        self.write("\x1b[?1015h")
-        self.write("\x1b[?1049h") # Alt screen
-        self.write("\x1b[?25l")   # Hide cursor
-        self.flush()
+        # Left buffered so it goes out in the same channel write as the first frame
+        self.write(_ENABLE_TTY)
 
-        event = Resize(Size(*size), Size(*size))
+        term_size = Size(size[0], size[1])
+        event = Resize(term_size, term_size)
         self.process_message(event)
         
-        # Dispatch again after a short delay to ensure app is ready
-        loop = asyncio.get_running_loop()
-        loop.call_later(0.05, self.process_message, event)
-
-    def disable_input(self) -> None:
-        print("WhistlerDriver.disable_input", file=sys.stderr, flush=True)
-        self.exit_event.set()
-
-    def stop_application_mode(self) -> None:
-        print("WhistlerDriver.stop_application_mode", file=sys.stderr, flush=True)
-        self.write("\x1b[?1000l") # Disable mouse support
-        self.write("\x1b[?1006l")
-        self.write("\x1b[?1015l")
-        self.write("\x1b[?1049l") # Disable alt screen
-        self.write("\x1b[?25h")   # Show cursor
-        self.flush()
-
-    def feed_data(self, data: str | bytes) -> None:
-        if isinstance(data, bytes):
-            data = data.decode('utf-8')
-        # if len(data) > 0 and data[0] == '\x1b':
-        #    print(f"WhistlerDriver.feed_data escape: {repr(data)}", file=sys.stderr, flush=True)
-        for event in self._parser.feed(data):
-            self.process_message(event)
-
-    def process_message(self, event: Event) -> None:
+        # Dispatch again once the app has rendered, in case the screen wasn't there for the first one
         if self._app:
-            self._app.post_message(event)
+            self._app.call_after_refresh(self.process_message, event)
 
     def disable_input(self) -> None:
-        print("WhistlerDriver.disable_input", file=sys.stderr, flush=True)
-        self.exit_event.set()
+        logger.debug("WhistlerDriver.disable_input")
+        if self.exit_event is not None and not self.exit_event.done():
+            self.exit_event.set_result(None)
 
     def stop_application_mode(self) -> None:
-        print("WhistlerDriver.stop_application_mode", file=sys.stderr, flush=True)
-        self.write("\x1b[?1000l") # Disable mouse support
-        self.write("\x1b[?1006l")
-        self.write("\x1b[?1015l")
-        self.write("\x1b[?1049l") # Disable alt screen
-        self.write("\x1b[?25h")   # Show cursor
+        logger.debug("WhistlerDriver.stop_application_mode")
+        # The terminal has to be restored even if the client is behind
+        self._output_paused = False
+        self.write(_DISABLE_TTY)
         self.flush()
+        self._channel_write = None
 
-    def feed_data(self, data: str | bytes) -> None:
-        if isinstance(data, bytes):
-            data = data.decode('utf-8')
-        # if len(data) > 0 and data[0] == '\x1b':
-        #    print(f"WhistlerDriver.feed_data escape: {repr(data)}", file=sys.stderr, flush=True)
+    def feed_data(self, data: bytes) -> None:
+        # Input comes off a channel without an encoding, always bytes
+        data = self._decoder.decode(data)
+        if not data:
+            return
+        if not self._app:
+            for _ in self._parser.feed(data):
+                pass
+            return
+        # Resolve the app's post_message once per chunk instead of once per event
+        post_message = self._app.post_message
         for event in self._parser.feed(data):
-            self.process_message(event)
+            post_message(event)
 
-    def process_message(self, event: Event) -> None:
+    def process_message(self, event: Message) -> None:
         if self._app:
             self._app.post_message(event)
 
@@ -137,7 +235,7 @@ class LoadingApp(App):
         self._should_exit = False
     
     def on_mount(self) -> None:
-        print("LoadingApp.on_mount", file=sys.stderr, flush=True)
+        logger.debug("LoadingApp.on_mount")
         self.loading_screen = LoadingScreen(initial_status=self.initial_status)
         self.push_screen(self.loading_screen)
     
@@ -148,11 +246,11 @@ class LoadingApp(App):
     
     def request_exit(self) -> None:
         """Request the app to exit."""
-        print("LoadingApp.request_exit", file=sys.stderr, flush=True)
+        logger.debug("LoadingApp.request_exit")
         self._should_exit = True
         self.exit()
 
-async def start_server():
+def parse_cli() -> ConfigManager:
     parser = argparse.ArgumentParser(description="Whistler SSH Server")
     parser.add_argument("--kubeconfig", help="Path to kubeconfig file")
     parser.add_argument("--in-cluster", action="store_true", help="Run in Kubernetes in-cluster mode")
@@ -160,34 +258,72 @@ async def start_server():
 
     # Always run in K8s mode
     mode = "in-cluster" if args.in_cluster else f"config: {args.kubeconfig}" if args.kubeconfig else "default"
-    print(f"Starting in Kubernetes mode ({mode})", file=sys.stderr)
-    config_manager = KubeConfigManager(kubeconfig=args.kubeconfig)
-    
+    logger.info(f"Starting in Kubernetes mode ({mode})")
+    return KubeConfigManager(kubeconfig=args.kubeconfig)
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    # WHISTLER_EVENT_LOOP: "auto" (uvloop if installed), "asyncio", "uvloop",
+    # or "module:factory" for any other loop implementation (e.g. an io_uring one)
+    choice = os.environ.get("WHISTLER_EVENT_LOOP", "auto")
+    if choice == "asyncio" or (choice == "auto" and uvloop is None):
+        return asyncio.new_event_loop()
+    if choice in ("auto", "uvloop"):
+        if uvloop is None:
+            raise RuntimeError("WHISTLER_EVENT_LOOP=uvloop but uvloop is not installed")
+        return uvloop.new_event_loop()
+    module_name, _, factory = choice.partition(":")
+    if not factory:
+        raise RuntimeError(f"Invalid WHISTLER_EVENT_LOOP value: {choice}")
+    import importlib
+    return getattr(importlib.import_module(module_name), factory)()
+
+async def start_server(config_manager: ConfigManager):
     # Create a partial to pass config_manager to SSHServer
     server_factory = partial(SSHServer, config_manager=config_manager)
 
+    # Deep accept queue for connection bursts
     await asyncssh.create_server(server_factory, '', 8022,
+                                 backlog=4096,
                                  server_host_keys=['ssh_host_key'],
                                  line_editor=False,
                                  agent_forwarding=True,
                                  keepalive_interval=30,
                                  keepalive_count_max=5)
 
+def _split_login(username):
+    """Split "user-target" into the interned user and the target, None for a bare user."""
+    user, sep, target = username.partition('-')
+    return sys.intern(user), (target if sep else None)
+
 class SSHServer(asyncssh.SSHServer):
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.username = None
         self.target_type = "tui" # tui, template, instance
         self.target_name = None
+        self.active_instance_name = None
+        # (instance_name, pod_name, namespace) of the running instance forwards go to
+        self._forward_target = None
 
     def connection_made(self, conn):
-        print('SSH connection received from %s.' % conn.get_extra_info('peername')[0], file=sys.stderr)
+        # Keystroke echoes and small redraws must not wait on Nagle
+        sock = conn.get_extra_info('socket')
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+
+        if logger.isEnabledFor(logging.INFO):
+            # peername is None for non-TCP transports
+            peer = conn.get_extra_info('peername')
+            logger.info(f"SSH connection received from {peer[0] if peer else '?'}.")
 
     def connection_lost(self, exc):
         if exc:
-            print('SSH connection error: ' + str(exc), file=sys.stderr)
+            logger.warning(f'SSH connection error: {exc}')
         else:
-            print('SSH connection closed.', file=sys.stderr)
+            logger.info('SSH connection closed.')
 
     def begin_auth(self, username):
         # We require public key auth now
@@ -205,24 +341,11 @@ class SSHServer(asyncssh.SSHServer):
         if os.environ.get("WHISTLER_AUTH_ALLOW_ANY") != "true":
             return False
             
-        print(f"Dev mode: allowing {username} via password auth", file=sys.stderr)
+        logger.info(f"Dev mode: allowing {username} via password auth")
         
-        parts = username.split('-')
-        real_user = parts[0]
+        real_user, suffix = _split_login(username)
         self.username = real_user
-        
-        # Determine target (same logic as before)
-        if len(parts) == 1:
-            self.target_type = "tui"
-        elif len(parts) >= 2:
-            suffix = "-".join(parts[1:])
-            templates = self.config_manager.get_user_templates(real_user)
-            if any(t['name'] == suffix for t in templates):
-                self.target_type = "template"
-                self.target_name = suffix
-            else:
-                self.target_type = "instance"
-                self.target_name = suffix
+        self._set_target(real_user, suffix)
         return True
 
     def public_key_auth_supported(self):
@@ -230,65 +353,45 @@ class SSHServer(asyncssh.SSHServer):
         
 
     def validate_public_key(self, username, key):
-        parts = username.split('-')
-        real_user = parts[0]
+        real_user, suffix = _split_login(username)
         
         # Check for dev mode bypass
         if os.environ.get("WHISTLER_AUTH_ALLOW_ANY") == "true":
-             print(f"Dev mode: allowing {real_user} without key check", file=sys.stderr)
+             logger.info(f"Dev mode: allowing {real_user} without key check")
              self.username = real_user
-             
-             # Determine target (same logic as before)
-             if len(parts) == 1:
-                 self.target_type = "tui"
-             elif len(parts) >= 2:
-                 suffix = "-".join(parts[1:])
-                 templates = self.config_manager.get_user_templates(real_user)
-                 if any(t['name'] == suffix for t in templates):
-                     self.target_type = "template"
-                     self.target_name = suffix
-                 else:
-                     self.target_type = "instance"
-                     self.target_name = suffix
-                     self.active_instance_name = suffix
+             self._set_target(real_user, suffix)
              return True
 
         # Check if user exists and key matches
         if not self.config_manager.user_exists(real_user):
-             print(f"User {real_user} not found", file=sys.stderr)
+             logger.warning(f"User {real_user} not found")
              return False
              
-        allowed_keys = self.config_manager.get_user_public_keys(real_user)
-        key_data = key.export_public_key().decode('utf-8').split()[1] # Extract base64 part
-        
-        # Simple check: is the key in the allowed list?
-        # Note: allowed_keys in values.yaml might be full "ssh-rsa AAA..." strings
-        for allowed in allowed_keys:
-            if key_data in allowed:
-                self.username = real_user
-                
-                # Determine target (same logic as before)
-                if len(parts) == 1:
-                    self.target_type = "tui"
-                elif len(parts) >= 2:
-                    suffix = "-".join(parts[1:])
-                    templates = self.config_manager.get_user_templates(real_user)
-                    if any(t['name'] == suffix for t in templates):
-                        self.target_type = "template"
-                        self.target_name = suffix
-                    else:
-                        self.target_type = "instance"
-                        self.target_name = suffix
-                        self.active_instance_name = suffix
-                
-                print(f"User {real_user} authenticated via public key. Target: {self.target_type} {self.target_name}", file=sys.stderr)
-                return True
-                
-        print(f"Public key validation failed for {real_user}", file=sys.stderr)
+        # Exact match on the key's wire-format blob against the user's configured keys
+        if key.public_data in self.config_manager.get_user_key_blobs(real_user):
+            self.username = real_user
+            self._set_target(real_user, suffix)
+            logger.info(f"User {real_user} authenticated via public key. Target: {self.target_type} {self.target_name}")
+            return True
+
+        logger.warning(f"Public key validation failed for {real_user}")
         return False
 
+    def _resolve_target(self, real_user, suffix):
+        """Map the part of the login name after the user to (target_type, target_name)."""
+        if suffix is None:
+            return "tui", None
+        if suffix in self.config_manager.get_user_template_names(real_user):
+            return "template", suffix
+        return "instance", suffix
+
+    def _set_target(self, real_user, suffix):
+        self.target_type, self.target_name = self._resolve_target(real_user, suffix)
+        if self.target_type == "instance":
+            self.active_instance_name = self.target_name
+
     def session_requested(self):
-        print("SSHServer.session_requested", file=sys.stderr, flush=True)
+        logger.debug("SSHServer.session_requested")
         return WhistlerSession(
             server=self,
             config_manager=self.config_manager, 
@@ -298,39 +401,73 @@ class SSHServer(asyncssh.SSHServer):
         )
     
     async def connection_requested(self, dest_host, dest_port, orig_host, orig_port):
-        print(f"Connection requested: {dest_host}:{dest_port} from {orig_host}:{orig_port}", file=sys.stderr)
+        logger.debug(f"Connection requested: {dest_host}:{dest_port} from {orig_host}:{orig_port}")
+
+        # TUI logins never get an active instance, refuse without consulting the config
+        if self.target_type == "tui":
+            raise asyncssh.ChannelOpenError(
+                asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED,
+                "Forwarding not available in TUI mode"
+            )
         
         # Only allow forwarding to localhost (which maps to the container)
         if dest_host not in ("localhost", "127.0.0.1"):
-            print(f"Forwarding denied: destination {dest_host} not allowed (only localhost)", file=sys.stderr)
+            logger.warning(f"Forwarding denied: destination {dest_host} not allowed (only localhost)")
             raise asyncssh.ChannelOpenError(
                 asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED,
                 "Forwarding is only allowed to localhost (the container)"
             )
             
-        instance_name = getattr(self, "active_instance_name", None)
+        instance_name = self.active_instance_name
         if not instance_name:
-             print("Forwarding denied: no active instance", file=sys.stderr)
+             logger.warning("Forwarding denied: no active instance")
              raise asyncssh.ChannelOpenError(
                 asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED,
                 "No active container instance found for forwarding"
             )
             
-        # Resolve instance
-        instances = self.config_manager.get_user_instances(self.username)
-        instance = next((i for i in instances if i["name"] == instance_name), None)
-        
-        if instance and instance.get("podName") and instance.get("status") == "Running":
-            print(f"Tunneling {dest_host}:{dest_port} -> Pod {instance['podName']}:127.0.0.1:{dest_port}", file=sys.stderr)
-            return await self._create_pod_tunnel(instance['podName'], instance.get('namespace'), dest_port)
-        else:
-            print(f"Forwarding failed: instance {instance_name} not running or not found", file=sys.stderr)
+        # Resolve instance, once per connection: clients often open many forwards in a burst
+        target = self._forward_target
+        if target is None or target[0] != instance_name:
+            instance = await asyncio.get_running_loop().run_in_executor(
+                None, self.config_manager.get_user_instance, self.username, instance_name
+            )
+            if not (instance and instance.get("podName") and instance.get("status") == "Running"):
+                logger.warning(f"Forwarding failed: instance {instance_name} not running or not found")
+                raise asyncssh.ChannelOpenError(
+                    asyncssh.OPEN_CONNECT_FAILED,
+                    f"Container {instance_name} is not reachable"
+                )
+            target = self._forward_target = (instance_name, instance['podName'], instance.get('namespace'))
+
+        _, pod_name, namespace = target
+        logger.info(f"Tunneling {dest_host}:{dest_port} -> Pod {pod_name}:127.0.0.1:{dest_port}")
+        try:
+            return await self._create_pod_tunnel(pod_name, namespace, dest_port)
+        except asyncssh.ChannelOpenError:
+            # The pod may have gone away, look the instance up again next time
+            self._forward_target = None
+            raise
+
+    async def _create_pod_tunnel(self, pod_name, namespace, port):
+        if _TUNNEL_VIA_KUBECTL:
+            return await self._create_kubectl_tunnel(pod_name, namespace, port)
+
+        # The portforward API connects to localhost in the pod's network namespace,
+        # its websocket is pumped by a client thread into one end of a socketpair
+        try:
+            pf = await asyncio.get_running_loop().run_in_executor(
+                None, _open_portforward, self.config_manager, pod_name, namespace, port
+            )
+            return await asyncio.open_connection(sock=_stream_socket(pf.socket(port)))
+        except Exception as e:
+            logger.error(f"Failed to create tunnel: {e}")
             raise asyncssh.ChannelOpenError(
                 asyncssh.OPEN_CONNECT_FAILED,
-                f"Container {instance_name} is not reachable"
+                f"Tunnel creation failed: {e}"
             )
 
-    async def _create_pod_tunnel(self, pod_name, namespace, port):
+    async def _create_kubectl_tunnel(self, pod_name, namespace, port):
         # Use kubectl exec + socat to tunnel to localhost inside the pod
         # This handles services bound to 127.0.0.1 strictly
         cmd = [
@@ -352,15 +489,16 @@ class SSHServer(asyncssh.SSHServer):
                     while True:
                         line = await process.stderr.readline()
                         if not line: break
-                        print(f"Tunnel {pod_name}:{port} stderr: {line.decode().strip()}", file=sys.stderr)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Tunnel {pod_name}:{port} stderr: {line.decode(errors='replace').strip()}")
                 except Exception:
                     pass
 
-            asyncio.create_task(log_stderr())
+            _spawn(log_stderr(), name=f"whistler-tunnel-log-{pod_name}-{port}")
             
             return process.stdout, process.stdin
         except Exception as e:
-            print(f"Failed to create tunnel: {e}", file=sys.stderr)
+            logger.error(f"Failed to create tunnel: {e}")
             raise asyncssh.ChannelOpenError(
                 asyncssh.OPEN_CONNECT_FAILED,
                 f"Tunnel creation failed: {e}"
@@ -389,13 +527,48 @@ class WhistlerSession(asyncssh.SSHServerSession):
         self.pod_socket_path = None
         self.term_type = None
         self._process_stdin = None
+        # Waits for process stdin to drain while channel reading is paused
+        self._stdin_drain_task = None
         self.is_ephemeral = False
-        print("WhistlerSession initialized", file=sys.stderr, flush=True)
+        self._in_buf: list[bytes] = []
+        self._drain_scheduled = False
+        self._pty_reader = None
+        self._pty_pending = bytearray()
+        # Input for the master collected during this loop turn
+        self._pty_chunks: list[bytes] = []
+        self._pty_flush_scheduled = False
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+        self._loop = None
+        # Applies a new (cols, rows) to whatever stands behind _master_fd
+        self._pty_resize = None
+        # Last (cols, rows) applied through it
+        self._pty_size = None
+        logger.debug("WhistlerSession initialized")
 
     def connection_made(self, chan):
-        print("WhistlerSession.connection_made", file=sys.stderr, flush=True)
+        logger.debug("WhistlerSession.connection_made")
         self._chan = chan
+        self._loop = asyncio.get_running_loop()
         self._chan.set_encoding(None)
+        self._chan.set_write_buffer_limits(high=_WRITE_HIGH_WATER)
+
+    def pause_writing(self):
+        # The client isn't keeping up, stop producing output until the channel drains
+        self._can_write.clear()
+        driver = getattr(self._app, 'driver', None)
+        if driver:
+            driver.pause_output()
+        if self._master_fd is not None and self._pty_reader:
+            self._loop.remove_reader(self._master_fd)
+
+    def resume_writing(self):
+        self._can_write.set()
+        driver = getattr(self._app, 'driver', None)
+        if driver:
+            driver.resume_output()
+        if self._master_fd is not None and self._pty_reader:
+            self._loop.add_reader(self._master_fd, self._pty_reader)
 
     def pty_requested(self, term_type, term_size, term_modes):
         self.initial_term_size = (term_size[0], term_size[1])
@@ -403,63 +576,129 @@ class WhistlerSession(asyncssh.SSHServerSession):
         return True
 
     def shell_requested(self):
-        print("WhistlerSession.shell_requested", file=sys.stderr, flush=True)
+        logger.debug("WhistlerSession.shell_requested")
         return True
 
     def data_received(self, data, datatype):
-        # Debugging input data
-        # print(f"DEBUG: WhistlerSession.data_received: len={len(data)} val={repr(data)}", file=sys.stderr, flush=True)
-        if self._app:
+        # The channel has no encoding set, data is always bytes
+        app = self._app
+        if app:
              # Check for Ctrl-C explicitly to handle race conditions where driver is not ready or fails to route
-             is_ctrl_c = False
-             if isinstance(data, bytes) and b'\x03' in data:
-                 is_ctrl_c = True
-             elif isinstance(data, str) and '\x03' in data:
-                 is_ctrl_c = True
-             
-             if is_ctrl_c:
-                 if hasattr(self._app, 'exit'):
-                     self._app.exit("cancelled")
-                     return
-
-             if hasattr(self._app, 'driver') and self._app.driver:
-                self._app.driver.feed_data(data)
+             if b'\x03' in data and hasattr(app, 'exit'):
+                 app.exit("cancelled")
+                 return
+
+             if getattr(app, 'driver', None):
+                # Bursts (paste, drags, scrolling) reach the parser as one chunk per loop turn
+                self._in_buf.append(data)
+                if not self._drain_scheduled:
+                    self._drain_scheduled = True
+                    self._loop.call_soon(self._drain_input)
         elif self._master_fd is not None:
              # Forward to PTY master
-             try:
-                 os.write(self._master_fd, data.encode('utf-8') if isinstance(data, str) else data)
-             except OSError:
-                 pass
+             self._write_pty(data)
         elif self._process_stdin is not None:
              # Forward to process stdin (non-PTY)
              try:
-                 self._process_stdin.write(data.encode('utf-8') if isinstance(data, str) else data)
-                 # self._process_stdin.drain() # Not async here, need to check if we can await or if it's buffered
+                 self._process_stdin.write(data)
+                 if (self._stdin_drain_task is None
+                         and self._process_stdin.transport.get_write_buffer_size() > _WRITE_HIGH_WATER):
+                     # Stop taking input until the process catches up
+                     self._chan.pause_reading()
+                     self._stdin_drain_task = _spawn(
+                         self._resume_reading_after_drain(self._process_stdin), name=f"whistler-stdin-{self.username}"
+                     )
              except Exception:
                  pass
 
+    async def _resume_reading_after_drain(self, writer):
+        try:
+            await writer.drain()
+        finally:
+            self._stdin_drain_task = None
+            self._chan.resume_reading()
+
+    def _write_pty(self, data):
+        # The master is non-blocking, whatever the PTY can't take yet waits for a writer callback
+        if self._pty_pending:
+            self._pty_pending += data
+            if len(self._pty_pending) > _WRITE_HIGH_WATER:
+                self._chan.pause_reading()
+            return
+        # Keystrokes and paste chunks arriving in one loop turn go out in a single writev
+        self._pty_chunks.append(data)
+        if not self._pty_flush_scheduled:
+            self._pty_flush_scheduled = True
+            self._loop.call_soon(self._write_pty_chunks)
+
+    def _write_pty_chunks(self):
+        self._pty_flush_scheduled = False
+        chunks = self._pty_chunks
+        if self._master_fd is None:
+            chunks.clear()
+            return
+        if len(chunks) > _IOV_MAX:
+            chunks[:] = [b"".join(chunks)]
+        try:
+            written = os.writev(self._master_fd, chunks)
+        except BlockingIOError:
+            written = 0
+        except OSError:
+            chunks.clear()
+            return
+        for chunk in chunks:
+            if written < len(chunk):
+                self._pty_pending += chunk[written:]
+                written = 0
+            else:
+                written -= len(chunk)
+        chunks.clear()
+        if self._pty_pending:
+            self._loop.add_writer(self._master_fd, self._flush_pty)
+            if len(self._pty_pending) > _WRITE_HIGH_WATER:
+                self._chan.pause_reading()
+
+    def _flush_pty(self):
+        try:
+            written = os.write(self._master_fd, self._pty_pending)
+        except BlockingIOError:
+            return
+        except OSError:
+            written = len(self._pty_pending)
+        del self._pty_pending[:written]
+        if not self._pty_pending:
+            self._loop.remove_writer(self._master_fd)
+            self._chan.resume_reading()
+
+    def _drain_input(self):
+        self._drain_scheduled = False
+        data = b"".join(self._in_buf)
+        self._in_buf.clear()
+        driver = getattr(self._app, 'driver', None)
+        if data and driver:
+            driver.feed_data(data)
+
     def signal_received(self, signal):
-        # print(f"DEBUG: WhistlerSession.signal_received: {signal}", file=sys.stderr, flush=True)
         if signal == 'INT' or signal == 'TERM':
              if self._app and hasattr(self._app, 'action_cancel'):
-                 asyncio.create_task(self._app.action_cancel())
+                 _spawn(self._app.action_cancel(), name=f"whistler-cancel-{self.username}")
              elif self._app and hasattr(self._app, 'exit'):
                  self._app.exit("cancelled")
 
     def break_received(self, msec):
-        print(f"WhistlerSession.break_received: {msec}", file=sys.stderr, flush=True)
+        logger.debug(f"WhistlerSession.break_received: {msec}")
         # Treat break as Ctrl-C
         if self._app and hasattr(self._app, 'action_cancel'):
-             asyncio.create_task(self._app.action_cancel())
+             _spawn(self._app.action_cancel(), name=f"whistler-cancel-{self.username}")
         elif self._app and hasattr(self._app, 'exit'):
              self._app.exit("cancelled")
 
     def exec_requested(self, command):
-        print(f"WhistlerSession.exec_requested: {command}", file=sys.stderr, flush=True)
+        logger.debug(f"WhistlerSession.exec_requested: {command}")
         return True
     
     def session_started(self):
-        print("WhistlerSession.session_started", file=sys.stderr, flush=True)
+        logger.debug("WhistlerSession.session_started")
         
         # Check for agent forwarding
         self.local_agent_path = self._chan.get_agent_path()
@@ -467,14 +706,14 @@ class WhistlerSession(asyncssh.SSHServerSession):
             import secrets
             # Generate a unique path for the pod socket
             self.pod_socket_path = f"/tmp/agent-{secrets.token_hex(4)}.sock"
-            print(f"Agent forwarding requested. Local: {self.local_agent_path}, Pod: {self.pod_socket_path}", file=sys.stderr)
+            logger.info(f"Agent forwarding requested. Local: {self.local_agent_path}, Pod: {self.pod_socket_path}")
 
         # Temporarily set TERM/COLORTERM based on client request so Textual/Rich picks it up
         old_term = os.environ.get('TERM')
         old_colorterm = os.environ.get('COLORTERM')
         old_escdelay = os.environ.get('ESCDELAY')
         
-        if hasattr(self, 'term_type') and self.term_type:
+        if self.term_type:
             os.environ['TERM'] = self.term_type
             # Assume truecolor support for modern SSH clients if not specified
             os.environ['COLORTERM'] = 'truecolor'
@@ -483,17 +722,17 @@ class WhistlerSession(asyncssh.SSHServerSession):
             if self.target_type == "tui":
                 self._app = WhistlerApp(driver_class=WhistlerDriver, config_manager=self.config_manager, username=self.username, session=self)
                 self._app.ssh_channel = self._chan
-                self._app_task = asyncio.create_task(self._run_app())
+                self._app_task = asyncio.create_task(self._run_app(), name=f"whistler-app-{self.username}")
             elif self.target_type == "instance":
                 # Find the instance
-                self._shell_task = asyncio.create_task(self._connect_to_instance())
+                self._shell_task = asyncio.create_task(self._connect_to_instance(), name=f"whistler-shell-{self.username}-{self.target_name}")
             elif self.target_type == "template":
-                 self._shell_task = asyncio.create_task(self._create_and_connect_ephemeral())
+                 self._shell_task = asyncio.create_task(self._create_and_connect_ephemeral(), name=f"whistler-ephemeral-{self.username}-{self.target_name}")
             else:
-                print(f"Target type {self.target_type} unknown, falling back to TUI", file=sys.stderr, flush=True)
+                logger.warning(f"Target type {self.target_type} unknown, falling back to TUI")
                 self._app = WhistlerApp(driver_class=WhistlerDriver, config_manager=self.config_manager, username=self.username, session=self)
                 self._app.ssh_channel = self._chan
-                self._app_task = asyncio.create_task(self._run_app())
+                self._app_task = asyncio.create_task(self._run_app(), name=f"whistler-app-{self.username}")
         finally:
             # Restore environment
             if old_term: os.environ['TERM'] = old_term
@@ -503,15 +742,14 @@ class WhistlerSession(asyncssh.SSHServerSession):
             else: os.environ.pop('COLORTERM', None)
 
     async def _run_app(self):
-        print("WhistlerSession._run_app starting", file=sys.stderr, flush=True)
+        logger.debug("WhistlerSession._run_app starting")
         try:
             # Run the app with our custom driver
             await self._app.run_async()
         except Exception as e:
-            print(f"App error: {e}", file=sys.stderr, flush=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception(f"App error: {e}")
         finally:
-            print("WhistlerSession._run_app finished", file=sys.stderr, flush=True)
+            logger.debug("WhistlerSession._run_app finished")
             self._chan.exit(0)
 
     async def _create_and_connect_ephemeral(self):
@@ -522,7 +760,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
          instance_name = f"{self.target_name}-{hex_id}"
          
          # Resolve full template name
-         templates = self.config_manager.get_user_templates(self.username)
+         templates = await self._loop.run_in_executor(None, self.config_manager.get_user_templates, self.username)
          template_obj = next((t for t in templates if t["name"] == self.target_name), None)
          template_ref = template_obj["fullName"] if template_obj else self.target_name
          
@@ -533,8 +771,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
              
              async def create_task():
                  # Create instance
-                 loop = asyncio.get_running_loop()
-                 success = await loop.run_in_executor(
+                 success = await self._loop.run_in_executor(
                      None, 
                      lambda: self.config_manager.add_instance(self.username, template_ref, instance_name, preemptible=True)
                  )
@@ -556,7 +793,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
              try:
                  result = await loading_app.run_async()
                  if result == "cancelled":
-                     print(f"User cancelled creation of {instance_name}", file=sys.stderr)
+                     logger.info(f"User cancelled creation of {instance_name}")
                      task.cancel()
                      try:
                          await task
@@ -570,22 +807,21 @@ class WhistlerSession(asyncssh.SSHServerSession):
                  if pod_name:
                      await self._run_pod_shell(pod_name)
              except asyncio.CancelledError:
-                 print("Task cancelled in _create_and_connect_ephemeral", file=sys.stderr, flush=True)
+                 logger.debug("Task cancelled in _create_and_connect_ephemeral")
                  task.cancel()
                  raise
              finally:
                  # Cleanup
-                 print(f"Entering finally block for {instance_name}", file=sys.stderr, flush=True)
+                 logger.debug(f"Entering finally block for {instance_name}")
                  try:
                      self._chan.write(f"\r\nCleaning up ephemeral instance {instance_name}...\r\n".encode('utf-8'))
                  except Exception:
                      pass
                  try:
-                     loop = asyncio.get_running_loop()
-                     await loop.run_in_executor(None, self.config_manager.delete_instance, self.username, instance_name)
-                     print(f"delete_instance called for {instance_name}", file=sys.stderr, flush=True)
+                     await self._loop.run_in_executor(None, self.config_manager.delete_instance, self.username, instance_name)
+                     logger.debug(f"delete_instance called for {instance_name}")
                  except Exception as e:
-                     print(f"Error calling delete_instance: {e}", file=sys.stderr, flush=True)
+                     logger.error(f"Error calling delete_instance: {e}")
                  try:
                      # Restore terminal state explicitly: Show Cursor, Disable Alt Screen
                      self._chan.write(b"\x1b[?25h\x1b[?1049l")
@@ -599,29 +835,30 @@ class WhistlerSession(asyncssh.SSHServerSession):
              # Non-PTY mode: use simple text output
              self._chan.write(f"Creating ephemeral instance {instance_name} (full name: {self.username}-{instance_name}) from template {self.target_name}...\r\n".encode('utf-8'))
              
-             if self.config_manager.add_instance(self.username, template_ref, instance_name):
+             if await self._loop.run_in_executor(
+                 None, self.config_manager.add_instance, self.username, template_ref, instance_name
+             ):
                  try:
                      self.target_name = instance_name
                      await self._connect_to_instance()
                  except Exception as e:
-                     print(f"Error in _create_and_connect_ephemeral: {e}", file=sys.stderr, flush=True)
+                     logger.error(f"Error in _create_and_connect_ephemeral: {e}")
                      self._chan.write(f"Error connecting to instance: {e}\r\n".encode('utf-8'))
                  except asyncio.CancelledError:
-                     print("Task cancelled in _create_and_connect_ephemeral", file=sys.stderr, flush=True)
+                     logger.debug("Task cancelled in _create_and_connect_ephemeral")
                      raise
                  finally:
-                     print(f"Entering finally block for {instance_name}", file=sys.stderr, flush=True)
+                     logger.debug(f"Entering finally block for {instance_name}")
                      try:
                          self._chan.write(f"\r\nCleaning up ephemeral instance {instance_name}...\r\n".encode('utf-8'))
                      except Exception:
                          pass
                      try:
                          # Run blocking delete in executor
-                         loop = asyncio.get_running_loop()
-                         await loop.run_in_executor(None, self.config_manager.delete_instance, self.username, instance_name)
-                         print(f"delete_instance called for {instance_name}", file=sys.stderr, flush=True)
+                         await self._loop.run_in_executor(None, self.config_manager.delete_instance, self.username, instance_name)
+                         logger.debug(f"delete_instance called for {instance_name}")
                      except Exception as e:
-                         print(f"Error calling delete_instance: {e}", file=sys.stderr, flush=True)
+                         logger.error(f"Error calling delete_instance: {e}")
                      try:
                          self._chan.exit(0)
                      except Exception:
@@ -632,9 +869,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
     async def _connect_to_instance_with_app(self, loading_app):
         """Connect to instance using the provided loading app."""
-        loop = asyncio.get_running_loop()
-        instances = await loop.run_in_executor(None, self.config_manager.get_user_instances, self.username)
-        instance = next((i for i in instances if i["name"] == self.target_name), None)
+        instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, self.target_name)
         
         if not instance:
             loading_app.request_exit()
@@ -649,8 +884,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
             loading_app.update_status("Waiting for existing pod to terminate...")
             while instance and instance.get("status") == "Terminating":
                 await asyncio.sleep(0.5)
-                instances = await loop.run_in_executor(None, self.config_manager.get_user_instances, self.username)
-                instance = next((i for i in instances if i["name"] == self.target_name), None)
+                instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, self.target_name)
             
             if instance:
                 pod_name = instance.get("podName")
@@ -668,9 +902,9 @@ class WhistlerSession(asyncssh.SSHServerSession):
                         "whistlerinstances", full_cr_name,
                         {"metadata": {"annotations": {"whistler.example.com/last-connect": str(time.time())}}}
                     )
-                await loop.run_in_executor(None, patch_ts)
+                await self._loop.run_in_executor(None, patch_ts)
             except Exception as e:
-                print(f"Failed to patch instance: {e}", file=sys.stderr)
+                logger.error(f"Failed to patch instance: {e}")
             
             loading_app.update_status(f"Starting instance {self.target_name}...")
             pod_name = await self._wait_for_pod_with_app(self.target_name, loading_app)
@@ -682,12 +916,12 @@ class WhistlerSession(asyncssh.SSHServerSession):
             # Update server context for forwarding
             if self.server:
                 self.server.active_instance_name = self.target_name
-                print(f"Updated server active_instance_name to {self.target_name}", file=sys.stderr)
+                logger.debug(f"Updated server active_instance_name to {self.target_name}")
 
             # Start agent bridge if needed
             if self.local_agent_path and self.pod_socket_path:
                 ns = instance.get("namespace", self.config_manager.namespace)
-                self._agent_task = asyncio.create_task(self._bridge_agent(pod_name, ns))
+                self._agent_task = asyncio.create_task(self._bridge_agent(pod_name, ns), name=f"whistler-agent-{pod_name}")
                 await asyncio.sleep(0.5)
 
             return pod_name
@@ -698,9 +932,6 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
     async def _connect_to_instance(self, loading_screen=None):
         """Connect to instance (for non-PTY mode)."""
-        instances = self.config_manager.get_user_instances(self.username)
-        instance = next((i for i in instances if i["name"] == self.target_name), None)
-        
         if self.term_type and not loading_screen:
             # PTY mode: use loading app
             loading_app = LoadingApp(self._chan, self.initial_term_size, f"Connecting to instance {self.target_name}...")
@@ -712,7 +943,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
             try:
                 result = await loading_app.run_async()
                 if result == "cancelled":
-                    print(f"User cancelled connection to {self.target_name}", file=sys.stderr)
+                    logger.info(f"User cancelled connection to {self.target_name}")
                     task.cancel()
                     try:
                         await task
@@ -736,6 +967,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
             return
         
         # Non-PTY mode or already have loading screen
+        instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, self.target_name)
         if not instance:
             self._chan.write(f"Instance {self.target_name} not found.\r\n".encode('utf-8'))
             self._chan.exit(1)
@@ -749,8 +981,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
             while instance and instance.get("status") == "Terminating":
                 await asyncio.sleep(0.5)
                 self._chan.write(b".")
-                instances = self.config_manager.get_user_instances(self.username)
-                instance = next((i for i in instances if i["name"] == self.target_name), None)
+                instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, self.target_name)
             self._chan.write(b"\r\n")
             
             if instance:
@@ -762,13 +993,14 @@ class WhistlerSession(asyncssh.SSHServerSession):
             try:
                 full_cr_name = f"{self.username}-{self.target_name}"
                 ns = instance.get("namespace", self.config_manager.namespace)
-                self.config_manager.api.patch_namespaced_custom_object(
+                await self._loop.run_in_executor(None, partial(
+                    self.config_manager.api.patch_namespaced_custom_object,
                     self.config_manager.group, self.config_manager.version, ns,
                     "whistlerinstances", full_cr_name,
                     {"metadata": {"annotations": {"whistler/last-connect": str(time.time())}}}
-                )
+                ))
             except Exception as e:
-                print(f"Failed to patch instance: {e}", file=sys.stderr)
+                logger.error(f"Failed to patch instance: {e}")
             
             pod_name = await self._wait_for_pod(self.target_name)
         
@@ -776,12 +1008,12 @@ class WhistlerSession(asyncssh.SSHServerSession):
             # Update server context for forwarding
             if self.server:
                 self.server.active_instance_name = self.target_name
-                print(f"Updated server active_instance_name to {self.target_name}", file=sys.stderr)
+                logger.debug(f"Updated server active_instance_name to {self.target_name}")
 
             # Start agent bridge if needed
             if self.local_agent_path and self.pod_socket_path:
                 ns = instance.get("namespace", self.config_manager.namespace)
-                self._agent_task = asyncio.create_task(self._bridge_agent(pod_name, ns))
+                self._agent_task = asyncio.create_task(self._bridge_agent(pod_name, ns), name=f"whistler-agent-{pod_name}")
                 await asyncio.sleep(0.5)
 
             await self._run_pod_shell(pod_name)
@@ -856,15 +1088,14 @@ class WhistlerSession(asyncssh.SSHServerSession):
         return "\n".join(message) + "\n"
 
     async def _run_pod_shell(self, pod_name):
-        print(f"Starting shell for pod {pod_name}", file=sys.stderr)
+        logger.info(f"Starting shell for pod {pod_name}")
         
         # Get instance and template info for MOTD
-        instances = self.config_manager.get_user_instances(self.username)
-        instance = next((i for i in instances if i["name"] == self.target_name), None)
+        instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, self.target_name)
         
         motd = ""
         if instance:
-            templates = self.config_manager.get_user_templates(self.username)
+            templates = await self._loop.run_in_executor(None, self.config_manager.get_user_templates, self.username)
             # TemplateRef in instance might be full name "user-template", but get_user_templates returns list with "name" (short) and "fullName"
             # Instance template ref is likely just the name if created via TUI? 
             # In config.py add_instance: "templateRef": template_name
@@ -874,9 +1105,9 @@ class WhistlerSession(asyncssh.SSHServerSession):
             
             all_volumes = self.config_manager.get_volumes() # Global volume definitions if needed
             motd = self._generate_motd(instance, template, all_volumes)
-            print(f"Generated MOTD for {self.username}: {len(motd)} chars", file=sys.stderr)
+            logger.debug(f"Generated MOTD for {self.username}: {len(motd)} chars")
         else:
-             print(f"MOTD: Instance {self.target_name} not found in {len(instances)} instances", file=sys.stderr)
+             logger.warning(f"MOTD: Instance {self.target_name} not found")
              motd = f"Connecting to {self.target_name}...\r\n(Instance details not found for MOTD)\r\n"
             
         if motd:
@@ -887,7 +1118,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
             # self._chan.write(b"\x1b[2J\x1b[H") 
             
             self._chan.write(formatted_motd.encode('utf-8'))
-            print("MOTD sent to channel", file=sys.stderr)
+            logger.debug("MOTD sent to channel")
             
             # Ensure the MOTD is sent before we hook up the PTY
             # asyncssh doesn't have drain on channel. buffer is managed.
@@ -896,6 +1127,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
         
         process = None
+        exit_status = 0
         use_pty = self.term_type is not None
         
         try:
@@ -919,12 +1151,9 @@ class WhistlerSession(asyncssh.SSHServerSession):
                 # PTY Mode
                 master, slave = pty.openpty()
                 self._master_fd = master
-                
-                # Set initial size
+                self._pty_resize = partial(_set_pty_size, master)
                 if self.initial_term_size:
-                    cols, rows = self.initial_term_size
-                    winsize = struct.pack("HHHH", rows, cols, 0, 0)
-                    fcntl.ioctl(master, termios.TIOCSWINSZ, winsize)
+                    self._resize_pty(*self.initial_term_size)
 
                 process = await asyncio.create_subprocess_exec(
                     *cmd,
@@ -932,34 +1161,53 @@ class WhistlerSession(asyncssh.SSHServerSession):
                     preexec_fn=os.setsid
                 )
                 os.close(slave) # Close slave in parent
+                os.set_blocking(master, False)
                 
-                loop = asyncio.get_running_loop()
-                pty_closed = loop.create_future()
+                pty_closed = self._loop.create_future()
                 
+                # Reused for every read, the channel copies what we hand it into its own send buffer
+                pty_buf = memoryview(bytearray(_PTY_BUF_SIZE))
+
                 def read_pty():
-                    try:
-                        data = os.read(master, 1024)
-                        if not data:
-                            if not pty_closed.done():
-                                pty_closed.set_result(True)
-                        else:
-                            self._chan.write(data)
-                    except (OSError, Exception):
-                        if not pty_closed.done():
-                            pty_closed.set_result(True)
-
-                loop.add_reader(master, read_pty)
+                    # Drain what the PTY has buffered and send it as one channel write.
+                    # The tty layer hands out at most ~4 KiB per read, so a short read
+                    # doesn't mean it's empty: keep going until EAGAIN or the buffer is full
+                    total = 0
+                    closed = False
+                    while total < _PTY_BUF_SIZE:
+                        try:
+                            n = os.readv(master, [pty_buf[total:]])
+                        except BlockingIOError:
+                            break
+                        except OSError:
+                            closed = True
+                            break
+                        if not n:
+                            closed = True
+                            break
+                        total += n
+                    if total:
+                        try:
+                            self._chan.write(pty_buf[:total])
+                        except Exception:
+                            closed = True
+                    if closed and not pty_closed.done():
+                        pty_closed.set_result(True)
+
+                self._pty_reader = read_pty
+                if self._can_write.is_set():
+                    self._loop.add_reader(master, read_pty)
                 
                 # Wait for either process exit or PTY close
-                wait_task = asyncio.create_task(process.wait())
+                waiters = [pty_closed, asyncio.create_task(process.wait())]
                 
                 try:
                     done, pending = await asyncio.wait(
-                        [wait_task, pty_closed], 
+                        waiters, 
                         return_when=asyncio.FIRST_COMPLETED
                     )
                 except asyncio.CancelledError:
-                    print("Shell task cancelled, cleaning up...", file=sys.stderr)
+                    logger.debug("Shell task cancelled, cleaning up...")
                     raise
 
             else:
@@ -975,12 +1223,13 @@ class WhistlerSession(asyncssh.SSHServerSession):
                 async def forward_output(reader, channel_write_func):
                     try:
                         while True:
-                            data = await reader.read(1024)
+                            await self._can_write.wait()
+                            data = await reader.read(_BRIDGE_CHUNK)
                             if not data:
                                 break
                             channel_write_func(data)
                     except Exception as e:
-                        print(f"Output forwarder error: {e}", file=sys.stderr)
+                        logger.error(f"Output forwarder error: {e}")
 
                 # Forward stdout -> channel stdout
                 stdout_task = asyncio.create_task(forward_output(process.stdout, self._chan.write))
@@ -993,40 +1242,62 @@ class WhistlerSession(asyncssh.SSHServerSession):
                     # Wait for output forwarding to finish (drain pipes)
                     await asyncio.gather(stdout_task, stderr_task)
                 except asyncio.CancelledError:
-                    print("Shell task cancelled, cleaning up...", file=sys.stderr)
+                    logger.debug("Shell task cancelled, cleaning up...")
                     stdout_task.cancel()
                     stderr_task.cancel()
                     raise
                 # finally: tasks are already done or cancelled
 
         except Exception as e:
-            print(f"Shell error: {e}", file=sys.stderr)
+            logger.error(f"Shell error: {e}")
+            exit_status = 1
         finally:
-            print("Shell finished, cleaning up resources...", file=sys.stderr)
-            loop = asyncio.get_running_loop()
+            logger.debug("Shell finished, cleaning up resources...")
             if self._master_fd:
-                loop.remove_reader(self._master_fd)
+                self._loop.remove_reader(self._master_fd)
+                self._loop.remove_writer(self._master_fd)
+                self._pty_pending.clear()
+                self._pty_chunks.clear()
                 os.close(self._master_fd)
                 self._master_fd = None
+            self._pty_reader = None
+            self._pty_resize = None
+            self._pty_size = None
             
             if process and process.returncode is None:
-                print("Terminating kubectl process...", file=sys.stderr)
+                logger.debug("Terminating kubectl process...")
                 try:
                     process.terminate()
                 except ProcessLookupError:
                     pass
+            elif process and process.returncode > 0:
+                # kubectl exits with the remote command's status
+                exit_status = process.returncode
             
-            self._chan.exit(0)
+            self._chan.exit(exit_status)
 
     async def _wait_for_pod_with_app(self, instance_name, loading_app, timeout=60):
         """Wait for pod to be ready, updating the loading app."""
-        loop = asyncio.get_running_loop()
-        start_time = loop.time()
+        stop = threading.Event()
+        def on_status(status):
+            if not stop.is_set():
+                self._loop.call_soon_threadsafe(loading_app.update_status, f"Instance status: {status}")
+
+        try:
+            return await self._loop.run_in_executor(None, partial(
+                self.config_manager.wait_for_instance_pod, self.username, instance_name, timeout, on_status, stop
+            ))
+        except Exception as e:
+            logger.warning(f"Watching pod for {instance_name} failed, polling instead: {e}")
+        finally:
+            # Cancelling the await leaves the watch thread running, tell it to give up
+            stop.set()
+
+        start_time = self._loop.time()
         last_status = None
         
-        while loop.time() - start_time < timeout:
-            instances = await loop.run_in_executor(None, self.config_manager.get_user_instances, self.username)
-            instance = next((i for i in instances if i["name"] == instance_name), None)
+        while self._loop.time() - start_time < timeout:
+            instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, instance_name)
             
             if instance:
                 status = instance.get("status")
@@ -1044,12 +1315,35 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
     async def _wait_for_pod(self, instance_name, timeout=60):
         """Wait for pod (non-PTY mode)."""
-        start_time = asyncio.get_running_loop().time()
+        statuses = []
+        stop = threading.Event()
+        def write_status(line):
+            # The client may have gone while the status was in flight
+            if not stop.is_set() and not self._chan.is_closing():
+                self._chan.write(line)
+
+        def on_status(status):
+            line = f"Instance status: {status} ".encode('utf-8')
+            if statuses:
+                line = b"\r\n" + line
+            statuses.append(status)
+            self._loop.call_soon_threadsafe(write_status, line)
+
+        try:
+            return await self._loop.run_in_executor(None, partial(
+                self.config_manager.wait_for_instance_pod, self.username, instance_name, timeout, on_status, stop
+            ))
+        except Exception as e:
+            logger.warning(f"Watching pod for {instance_name} failed, polling instead: {e}")
+        finally:
+            # Cancelling the await leaves the watch thread running, tell it to give up
+            stop.set()
+
+        start_time = self._loop.time()
         last_status = None
         
-        while asyncio.get_running_loop().time() - start_time < timeout:
-            instances = self.config_manager.get_user_instances(self.username)
-            instance = next((i for i in instances if i["name"] == instance_name), None)
+        while self._loop.time() - start_time < timeout:
+            instance = await self._loop.run_in_executor(None, self.config_manager.get_user_instance, self.username, instance_name)
             
             if instance:
                 status = instance.get("status")
@@ -1071,13 +1365,13 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
 
     def eof_received(self):
-        print("WhistlerSession.eof_received", file=sys.stderr, flush=True)
+        logger.debug("WhistlerSession.eof_received")
         if self._master_fd:
             try:
                 # Send EOT (Ctrl-D) to PTY
-                os.write(self._master_fd, b'\x04')
+                self._write_pty(b'\x04')
             except Exception as e:
-                 print(f"Error sending EOT to PTY: {e}", file=sys.stderr)
+                 logger.warning(f"Error sending EOT to PTY: {e}")
         elif self._process_stdin:
             try:
                 if self._process_stdin.can_write_eof():
@@ -1085,95 +1379,106 @@ class WhistlerSession(asyncssh.SSHServerSession):
                 else:
                      self._process_stdin.close()
             except Exception as e:
-                 print(f"Error closing stdin on EOF: {e}", file=sys.stderr)
+                 logger.warning(f"Error closing stdin on EOF: {e}")
         return False # Continue to allow output from command processing
 
     def terminal_size_changed(self, width, height, pixwidth, pixheight):
         if self._app:
-            self._pending_size = (width, height)
-            
-            if not self._resize_timer:
-                # Leading edge: process immediately
-                self._process_resize()
-                # Start cooldown timer
-                loop = asyncio.get_running_loop()
-                self._resize_timer = loop.call_later(0.1, self._resize_cooldown_expired)
+            size = (width, height)
+            # Apps started later in the session begin at the current size
+            self.initial_term_size = size
+            if size == self._pending_size and size == self._last_processed_size:
+                return
+            self._pending_size = size
+
+            # Debounce: one pending timer, re-armed on every event, fires once the drag settles
+            if self._resize_timer:
+                self._resize_timer.cancel()
+            self._resize_timer = self._loop.call_later(0.05, self._process_resize)
             
-        elif self._master_fd:
-             winsize = struct.pack("HHHH", height, width, 0, 0)
-             fcntl.ioctl(self._master_fd, termios.TIOCSWINSZ, winsize)
+        elif self._pty_resize:
+             try:
+                 self._resize_pty(width, height)
+             except Exception as e:
+                 # The shell may be going away underneath us
+                 logger.debug(f"Resize failed: {e}")
+
+    def _resize_pty(self, cols, rows):
+        # Window drags repeat sizes, only pass on actual changes
+        if (cols, rows) != self._pty_size:
+            self._pty_resize(cols, rows)
+            self._pty_size = (cols, rows)
 
     def _process_resize(self):
-        if self._app and self._pending_size:
+        self._resize_timer = None
+        if self._app and self._pending_size and self._pending_size != self._last_processed_size:
             width, height = self._pending_size
-            self._app.post_message(Resize(Size(width, height), Size(width, height)))
+            term_size = Size(width, height)
+            self._app.post_message(Resize(term_size, term_size))
             self._last_processed_size = self._pending_size
 
-    def _resize_cooldown_expired(self):
-        # Trailing edge: if pending size is different from what we last processed, process it now
-        if self._pending_size != self._last_processed_size:
-             self._process_resize()
-             # Restart timer to maintain rate limit if we just processed
-             loop = asyncio.get_running_loop()
-             self._resize_timer = loop.call_later(0.1, self._resize_cooldown_expired)
-        else:
-             self._resize_timer = None
-
     def connection_lost(self, exc):
-        print(f"WhistlerSession.connection_lost: {exc}", file=sys.stderr, flush=True)
+        logger.debug(f"WhistlerSession.connection_lost: {exc}")
+        if self._resize_timer:
+            self._resize_timer.cancel()
+            self._resize_timer = None
         if self._app_task:
-            print("Cancelling app task", file=sys.stderr, flush=True)
+            logger.debug("Cancelling app task")
             self._app_task.cancel()
         if self._shell_task:
-            print(f"Cancelling shell task {self._shell_task}", file=sys.stderr, flush=True)
+            logger.debug(f"Cancelling shell task {self._shell_task}")
             self._shell_task.cancel()
         if self._agent_task:
-            print("Cancelling agent task", file=sys.stderr, flush=True)
+            logger.debug("Cancelling agent task")
             self._agent_task.cancel()
 
     async def _bridge_agent(self, pod_name, namespace):
-        print(f"Starting agent bridge: {self.local_agent_path} -> pod {pod_name}:{self.pod_socket_path}", file=sys.stderr)
+        logger.info(f"Starting agent bridge: {self.local_agent_path} -> pod {pod_name}:{self.pod_socket_path}")
         try:
             # Ensure socat is available in the pod
             socat_bin = "socat"
             if not await self._is_command_available(pod_name, namespace, "socat"):
-                print(f"socat not found in pod {pod_name}, attempting to inject static binary...", file=sys.stderr)
+                logger.info(f"socat not found in pod {pod_name}, attempting to inject static binary...")
                 socat_bin = "/tmp/socat-static"
                 if not await self._is_file_present(pod_name, namespace, socat_bin):
                      await self._inject_static_socat(pod_name, namespace, socat_bin)
             
             # Connect to local agent socket
-            local_reader, local_writer = await asyncio.open_unix_connection(self.local_agent_path)
+            local = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            local.setblocking(False)
+            await self._loop.sock_connect(local, self.local_agent_path)
             
             # Start socat in pod using the determined binary path
             # Using fork again to allow multiple sequential connections (ssh behavior)
-            cmd = [
-                "kubectl", "exec", "-i", pod_name, "-n", namespace, "--",
-                socat_bin, f"UNIX-LISTEN:{self.pod_socket_path},fork,mode=600", "STDIO"
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            socat_cmd = [socat_bin, f"UNIX-LISTEN:{self.pod_socket_path},fork,mode=600", "STDIO"]
+
+            # socat's stdin/stdout end up behind a local socket
+            remote, theirs = socket.socketpair()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "kubectl", "exec", "-i", pod_name, "-n", namespace, "--", *socat_cmd,
+                    stdin=theirs,
+                    stdout=theirs,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            finally:
+                theirs.close()
+            remote.setblocking(False)
             
-            async def forward(reader, writer, name):
+            async def forward(src, dst, name):
+                # One buffer per direction, reused for every chunk
+                buf = memoryview(bytearray(_BRIDGE_CHUNK))
                 try:
-                    while True:
-                        data = await reader.read(4096)
-                        if not data:
-                            print(f"Bridge {name} closed (EOF)", file=sys.stderr)
-                            break
-                        writer.write(data)
-                        await writer.drain()
+                    while n := await self._loop.sock_recv_into(src, buf):
+                        await self._loop.sock_sendall(dst, buf[:n])
+                    logger.debug(f"Bridge {name} closed (EOF)")
                 except Exception as e:
-                    print(f"Bridge {name} error: {e}", file=sys.stderr)
+                    logger.error(f"Bridge {name} error: {e}")
                 finally:
+                    # Ends the other direction too, its reads on dst now see EOF
                     try:
-                        writer.close()
-                    except:
+                        dst.shutdown(socket.SHUT_RDWR)
+                    except OSError:
                         pass
             
             # Helper to read stderr
@@ -1181,31 +1486,39 @@ class WhistlerSession(asyncssh.SSHServerSession):
                 while True:
                     line = await reader.readline()
                     if not line: break
-                    print(f"Agent bridge stderr: {line.decode().strip()}", file=sys.stderr)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Agent bridge stderr: {line.decode(errors='replace').strip()}")
 
-            # local -> remote (process.stdin)
-            t1 = asyncio.create_task(forward(local_reader, process.stdin, "local->remote"))
-            # remote (process.stdout) -> local
-            t2 = asyncio.create_task(forward(process.stdout, local_writer, "remote->local"))
+            # local -> remote (socat's stdin)
+            t1 = asyncio.create_task(forward(local, remote, "local->remote"))
+            # remote (socat's stdout) -> local
+            t2 = asyncio.create_task(forward(remote, local, "remote->local"))
             # stderr logger
             t3 = asyncio.create_task(log_stderr(process.stderr))
             
-            await asyncio.gather(t1, t2)
+            try:
+                await asyncio.gather(t1, t2)
+            finally:
+                local.close()
+                remote.close()
             
         except Exception as e:
-             print(f"Agent bridge failed: {e}", file=sys.stderr)
+             logger.error(f"Agent bridge failed: {e}")
         finally:
-             print("Agent bridge finished", file=sys.stderr)
+             logger.debug("Agent bridge finished")
 
     async def _is_command_available(self, pod_name, namespace, cmd):
-        check_cmd = ["kubectl", "exec", pod_name, "-n", namespace, "--", "command", "-v", cmd]
-        process = await asyncio.create_subprocess_exec(
-            *check_cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
-        )
-        return await process.wait() == 0
+        return await self._pod_exec_succeeds(pod_name, namespace, ["command", "-v", cmd])
 
     async def _is_file_present(self, pod_name, namespace, path):
-        check_cmd = ["kubectl", "exec", pod_name, "-n", namespace, "--", "test", "-f", path]
+        return await self._pod_exec_succeeds(pod_name, namespace, ["test", "-f", path])
+
+    async def _pod_exec_succeeds(self, pod_name, namespace, command):
+        if not _TUNNEL_VIA_KUBECTL:
+            return await self._loop.run_in_executor(
+                None, _exec_succeeds, self.config_manager, pod_name, namespace, command
+            )
+        check_cmd = ["kubectl", "exec", pod_name, "-n", namespace, "--", *command]
         process = await asyncio.create_subprocess_exec(
             *check_cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
         )
@@ -1224,7 +1537,7 @@ class WhistlerSession(asyncssh.SSHServerSession):
              raise Exception(f"Bundled socat binary not found at {local_binary}")
         
         # Inject into pod
-        print(f"Injecting static socat from {local_binary} to {pod_name}:{target_path}...", file=sys.stderr)
+        logger.info(f"Injecting static socat from {local_binary} to {pod_name}:{target_path}...")
         # Use cat < local | kubectl exec ... "cat > target && chmod +x target"
         inject_cmd = [
             "kubectl", "exec", "-i", pod_name, "-n", namespace, "--",
@@ -1245,21 +1558,21 @@ class WhistlerSession(asyncssh.SSHServerSession):
 
 
 if __name__ == '__main__':
-    import logging
     logging.basicConfig(level=logging.INFO)
     asyncssh.set_debug_level(2)
 
-    # Generate a host key if it doesn't exist
-    try:
-        asyncssh.read_private_key('ssh_host_key')
-    except FileNotFoundError:
-        key = asyncssh.generate_private_key('ssh-rsa')
+    config_manager = parse_cli()
+
+    # Generate a host key if it doesn't exist (Ed25519 keygen is near-instant compared to RSA)
+    if not os.path.exists('ssh_host_key'):
+        key = asyncssh.generate_private_key('ssh-ed25519')
         key.write_private_key('ssh_host_key')
 
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
+    logger.info(f"Using event loop {type(loop).__module__}.{type(loop).__name__}")
     try:
-        loop.run_until_complete(start_server())
+        loop.run_until_complete(start_server(config_manager))
     except (OSError, asyncssh.Error) as exc:
         sys.exit('Error starting server: ' + str(exc))
 
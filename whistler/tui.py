@@ -4,6 +4,9 @@ from textual.widgets import Header, Footer, Static, DataTable, Input, Button, La
 from textual.containers import Container
 from textual.screen import ModalScreen, Screen
 import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 class InstanceCreateScreen(ModalScreen):
     BINDINGS = [("escape", "app.pop_screen", "Close")]
@@ -624,8 +627,7 @@ class WhistlerApp(App):
 
 
     def compose(self) -> ComposeResult:
-        import sys
-        print("WhistlerApp.compose", file=sys.stderr, flush=True)
+        logger.debug("WhistlerApp.compose")
         yield Header()
         logo = r"""
 ██╗    ██╗██╗  ██╗██╗███████╗████████╗██╗     ███████╗██████╗ 
@@ -691,8 +693,7 @@ class WhistlerApp(App):
             pass
 
     async def on_mount(self) -> None:
-        import sys
-        print("WhistlerApp.on_mount", file=sys.stderr, flush=True)
+        logger.debug("WhistlerApp.on_mount")
         self._setup_tables()
         # Initial fetch
         await self._update_cache()
@@ -712,10 +713,6 @@ class WhistlerApp(App):
 
         loop = asyncio.get_running_loop()
         try:
-            import sys
-            import time
-            start_time = time.perf_counter()
-            # print("Fetching data from Kubernetes...", file=sys.stderr)
             # Run blocking K8s calls in executor
             self.cached_templates = await loop.run_in_executor(
                 None, self.config_manager.get_user_templates, self.username
@@ -724,8 +721,7 @@ class WhistlerApp(App):
                 None, self.config_manager.get_user_instances, self.username
             )
         except Exception as e:
-            import sys
-            print(f"Failed to update cache: {e}", file=sys.stderr)
+            logger.error(f"Failed to update cache: {e}")
 
     def on_resize(self, event=None) -> None:
         if event:
@@ -998,10 +994,10 @@ if __name__ == "__main__":
     # Add parent directory to path to allow importing whistler modules
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     
-    from whistler.config import ConfigManager
+    from whistler.config import KubeConfigManager
 
     parser = argparse.ArgumentParser(description="Run Whistler TUI")
-    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument("--config", help="Path to kubeconfig file")
     parser.add_argument("--user", help="Username to load from config")
     args = parser.parse_args()
 
@@ -1009,12 +1005,12 @@ if __name__ == "__main__":
     username = None
 
     if args.config:
-        config_manager = ConfigManager(args.config)
+        config_manager = KubeConfigManager(kubeconfig=args.config)
         if args.user:
             username = args.user
-        elif config_manager.config.get("users"):
+        elif config_manager.users:
             # Default to first user if not specified
-            username = next(iter(config_manager.config["users"]))
+            username = next(iter(config_manager.users))
             print(f"No user specified, defaulting to: {username}")
 
     app = WhistlerApp(config_manager=config_manager, username=username)